@@ -8,7 +8,7 @@ import os
 import json
 from pathlib import Path
 from dotenv import load_dotenv
-from tweet_generator import XAlgorithmTweetGenerator, XProfileAnalyzer, TweetCredAnalyzer, TweetStyleAnalyzer, TweetScraper
+from tweet_generator import XAlgorithmTweetGenerator, XProfileAnalyzer, TweetCredAnalyzer, TweetStyleAnalyzer, TweetScraper, get_generation_cache, get_prompt_cache_stats
 
 # .env dosyasını yükle
 load_dotenv()
@@ -266,6 +266,18 @@ with st.sidebar:
     # Durum göstergeleri
     if st.session_state.anthropic_api_key:
         st.success("✅ AI Aktif")
+        with st.expander("📈 AI Cache İstatistikleri"):
+            gen_stats = get_generation_cache().stats()
+            prompt_stats = get_prompt_cache_stats().snapshot()
+            st.caption(
+                f"Yanıt cache: {gen_stats['hits']} hit / {gen_stats['misses']} miss "
+                f"(%{gen_stats['hit_rate'] * 100:.0f})"
+            )
+            st.caption(
+                f"Prompt cache: {prompt_stats['cache_hits']}/{prompt_stats['calls']} çağrı "
+                f"(%{prompt_stats['hit_rate'] * 100:.0f}), token'ların "
+                f"%{prompt_stats['cached_token_ratio'] * 100:.0f}'i cache'ten"
+            )
     else:
         st.warning("⚠️ AI için API key girin")
 
@@ -448,6 +460,18 @@ with tab1:
         with col6:
             include_emoji = st.checkbox("Emoji kullan", value=True, key="ai_emoji")
 
+        col7, col8 = st.columns(2)
+        with col7:
+            fresh_variant = st.checkbox(
+                "🎲 Yeni varyant üret", value=False, key="ai_fresh",
+                help="Aynı ayarlarla daha önce üretilmiş tweet'i cache'ten getirmek yerine yenisini üretir"
+            )
+        with col8:
+            best_of = st.slider(
+                "Aday sayısı (best-of-N)", 1, 6, 1, key="ai_best_of",
+                help="Tek çağrıda N aday üretir, Phoenix skoruna göre en iyisini seçer"
+            )
+
         custom_instructions = st.text_area(
             "Özel talimatlar (opsiyonel):",
             height=80,
@@ -457,32 +481,76 @@ with tab1:
 
         if st.button("🚀 Tweet Üret", type="primary", use_container_width=True, key="ai_generate"):
             if topic:
-                with st.spinner("🤖 AI tweet üretiyor..."):
-                    tweet = generator.generate_with_ai(
-                        topic=topic,
-                        style=style,
-                        tone=tone,
-                        length=length,
-                        include_cta=include_cta,
-                        include_emoji=include_emoji,
-                        custom_instructions=custom_instructions,
-                        language=language,
-                        profile=manual_profile
-                    )
-
-                st.success("Tweet üretildi!")
+                # Token'lar geldikçe göster
+                live = st.empty()
+                streamed = ""
+                tweet, analysis = "", None
+                candidates = []
+                if best_of > 1:
+                    with st.spinner(f"🤖 {best_of} aday üretiliyor..."):
+                        try:
+                            candidates = generator.generate_best_of(
+                                topic=topic,
+                                n=best_of,
+                                top_k=best_of,
+                                style=style,
+                                tone=tone,
+                                length=length,
+                                include_cta=include_cta,
+                                include_emoji=include_emoji,
+                                custom_instructions=custom_instructions,
+                                language=language,
+                                profile=manual_profile,
+                                fresh=fresh_variant
+                            )
+                            tweet, analysis = candidates[0].text, candidates[0].analysis
+                        except Exception as e:
+                            tweet = f"Hata: {str(e)}"
+                events = [] if best_of > 1 else generator.stream_with_ai(
+                    topic=topic,
+                    style=style,
+                    tone=tone,
+                    length=length,
+                    include_cta=include_cta,
+                    include_emoji=include_emoji,
+                    custom_instructions=custom_instructions,
+                    language=language,
+                    profile=manual_profile,
+                    fresh=fresh_variant
+                )
+                for event in events:
+                    if event.type == "text":
+                        streamed += event.text
+                        live.markdown(streamed + "▌")
+                    elif event.type == "done":
+                        tweet, analysis = event.text, event.analysis
+                    else:
+                        tweet = event.text
+                live.empty()
+
+                if analysis is not None:
+                    st.success("Tweet üretildi!")
                 st.text_area("Üretilen Tweet:", value=tweet, height=250, key="ai_result")
                 st.caption(f"📏 {len(tweet)} karakter")
 
                 # Analiz ve reach tahmini
                 col_a, col_b = st.columns(2)
                 with col_a:
-                    analysis = generator.analyze_tweet(tweet)
+                    analysis = analysis or generator.analyze_tweet(tweet)
                     st.metric("Algoritma Skoru", f"{analysis.score}/100")
 
                 with col_b:
                     reach = profile_analyzer.calculate_reach_prediction(manual_profile, analysis.score)
                     st.metric("Tahmini Görüntülenme", f"{reach['impressions']:,}")
+
+                if len(candidates) > 1:
+                    with st.expander(f"🏆 Diğer adaylar ({len(candidates) - 1})"):
+                        for candidate in candidates[1:]:
+                            st.markdown(
+                                f"**#{candidate.rank}** · Skor {candidate.analysis.score}/100 · "
+                                f"Phoenix {candidate.phoenix_score}"
+                            )
+                            st.text(candidate.text)
             else:
                 st.warning("Lütfen bir konu girin.")
 
@@ -731,7 +799,7 @@ with tab3:
             if st.button("🔄 Tweetleri Çek", type="primary", key="fetch_tweets_btn"):
                 if x_username:
                     with st.spinner(f"@{x_username} tweetleri çekiliyor..."):
-                        tweets = scraper.fetch_tweets(x_username, tweet_count)
+                        tweets = scraper.fetch_tweets(x_username, tweet_count, race=True)
 
                         if tweets:
                             st.session_state.user_tweets = tweets
@@ -1204,10 +1272,22 @@ with tab6:
                 key="thread_style"
             )
 
+        thread_fresh = st.checkbox("🎲 Yeni varyant üret", value=False, key="thread_fresh")
+
         if st.button("🧵 Thread Oluştur", type="primary", use_container_width=True, key="thread_btn"):
             if thread_topic:
-                with st.spinner(f"🧵 {tweet_count} tweet'lik thread üretiliyor..."):
-                    tweets = generator.generate_thread(thread_topic, tweet_count, thread_style, language)
+                live = st.empty()
+                streamed = ""
+                tweets = []
+                for event in generator.stream_thread(thread_topic, tweet_count, thread_style, language, fresh=thread_fresh):
+                    if event.type == "text":
+                        streamed += event.text
+                        live.markdown(streamed + "▌")
+                    elif event.type == "done":
+                        tweets = event.tweets
+                    else:
+                        tweets = [event.text]
+                live.empty()
 
                 st.success(f"{len(tweets)} tweet'lik thread oluşturuldu!")
 
@@ -1243,11 +1323,12 @@ with tab7:
             }[x],
             key="rewrite_style"
         )
+        rewrite_fresh = st.checkbox("🎲 Yeni varyant üret", value=False, key="rewrite_fresh")
 
         if st.button("✨ Yeniden Yaz", type="primary", use_container_width=True, key="rewrite_btn"):
             if original_tweet:
                 with st.spinner("✨ Tweet yeniden yazılıyor..."):
-                    new_tweet = generator.rewrite_tweet(original_tweet, rewrite_style, language)
+                    new_tweet = generator.rewrite_tweet(original_tweet, rewrite_style, language, fresh=rewrite_fresh)
 
                 col1, col2 = st.columns(2)
                 with col1:
@@ -41,19 +41,19 @@ async def create_ab_campaign(
             "started_at": datetime.now().isoformat(),
         }
 
-        supabase.table("ab_campaigns").insert(campaign).execute()
+        await supabase.table("ab_campaigns").insert(campaign).execute()
 
         # Create variants
         for i, content in enumerate(request.variants):
             # First create the tweet
-            tweet_result = supabase.table("tweets").insert({
+            tweet_result = await supabase.table("tweets").insert({
                 "user_id": user_id,
                 "content": content,
                 "status": "ab_test",
             }).select("*").single().execute()
 
             # Link to campaign
-            supabase.table("ab_variants").insert({
+            await supabase.table("ab_variants").insert({
                 "id": str(uuid.uuid4()),
                 "campaign_id": campaign_id,
                 "tweet_id": tweet_result.data["id"],
@@ -76,7 +76,7 @@ async def get_ab_campaigns(
 ):
     """Get all A/B test campaigns for the user."""
     try:
-        result = supabase.table("ab_campaigns") \
+        result = await supabase.table("ab_campaigns") \
             .select("*") \
             .eq("user_id", user_id) \
             .order("created_at", desc=True) \
@@ -104,7 +104,7 @@ async def get_ab_results(
     """
     try:
         # Get campaign
-        campaign_result = supabase.table("ab_campaigns") \
+        campaign_result = await supabase.table("ab_campaigns") \
             .select("*") \
             .eq("id", campaign_id) \
             .eq("user_id", user_id) \
@@ -118,7 +118,7 @@ async def get_ab_results(
             )
 
         # Get variants with tweet content
-        variants_result = supabase.table("ab_variants") \
+        variants_result = await supabase.table("ab_variants") \
             .select("*, tweets(content)") \
             .eq("campaign_id", campaign_id) \
             .execute()
@@ -182,7 +182,7 @@ async def set_ab_winner(
     """
     try:
         # Verify campaign ownership
-        campaign_result = supabase.table("ab_campaigns") \
+        campaign_result = await supabase.table("ab_campaigns") \
             .select("*") \
             .eq("id", campaign_id) \
             .eq("user_id", user_id) \
@@ -196,20 +196,20 @@ async def set_ab_winner(
             )
 
         # Clear previous winner
-        supabase.table("ab_variants") \
+        await supabase.table("ab_variants") \
             .update({"is_winner": False}) \
             .eq("campaign_id", campaign_id) \
             .execute()
 
         # Set new winner
-        supabase.table("ab_variants") \
+        await supabase.table("ab_variants") \
             .update({"is_winner": True}) \
             .eq("id", request.variant_id) \
             .eq("campaign_id", campaign_id) \
             .execute()
 
         # Update campaign status
-        supabase.table("ab_campaigns") \
+        await supabase.table("ab_campaigns") \
             .update({
                 "status": "completed",
                 "ended_at": datetime.now().isoformat()
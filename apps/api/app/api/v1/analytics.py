@@ -5,7 +5,7 @@ Performance metrics and insights.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from app.core.deps import SupabaseDep, UserDep
 
@@ -23,43 +23,18 @@ async def get_analytics_overview(
     Includes tweet counts, average performance, and trends.
     """
     try:
-        # Get all tweets
-        tweets_result = supabase.table("tweets") \
-            .select("*") \
-            .eq("user_id", user_id) \
-            .execute()
-
-        tweets = tweets_result.data or []
-
-        # Calculate metrics
-        total_tweets = len(tweets)
-        draft_count = sum(1 for t in tweets if t.get("status") == "draft")
-        scheduled_count = sum(1 for t in tweets if t.get("status") == "scheduled")
-        posted_count = sum(1 for t in tweets if t.get("status") == "posted")
-
-        # Average algorithm score
-        scores = [
-            t.get("analysis", {}).get("score", 0)
-            for t in tweets
-            if t.get("analysis") and isinstance(t.get("analysis"), dict)
-        ]
-        avg_score = sum(scores) / len(scores) if scores else 0
-
-        # Recent activity (last 7 days)
-        week_ago = (datetime.now() - timedelta(days=7)).isoformat()
-        recent_tweets = [
-            t for t in tweets
-            if t.get("created_at") and t.get("created_at") > week_ago
-        ]
+        # Aggregated in the database (tweet_analytics_overview, migration 003)
+        result = await supabase.rpc("tweet_analytics_overview", {"p_user_id": user_id}).execute()
+        row = (result.data or [{}])[0]
 
         return {
-            "total_tweets": total_tweets,
-            "draft_count": draft_count,
-            "scheduled_count": scheduled_count,
-            "posted_count": posted_count,
-            "avg_score": round(avg_score, 1),
-            "recent_activity": len(recent_tweets),
-            "high_performers": sum(1 for s in scores if s >= 70),
+            "total_tweets": row.get("total_tweets", 0),
+            "draft_count": row.get("draft_count", 0),
+            "scheduled_count": row.get("scheduled_count", 0),
+            "posted_count": row.get("posted_count", 0),
+            "avg_score": float(row.get("avg_score") or 0),
+            "recent_activity": row.get("recent_activity", 0),
+            "high_performers": row.get("high_performers", 0),
         }
 
     except Exception as e:
@@ -78,47 +53,27 @@ async def get_performance_data(
     """
     Get performance data over time.
 
-    Returns daily statistics for the specified period.
+    Returns daily statistics (UTC days) for the last `days` days, oldest first.
     """
     try:
-        # Get tweets from the specified period
-        start_date = (datetime.now() - timedelta(days=days)).isoformat()
+        # One pre-aggregated row per UTC day (tweet_daily_stats, migration 004)
+        start_day = (datetime.now(timezone.utc).date() - timedelta(days=days)).isoformat()
 
-        tweets_result = supabase.table("tweets") \
-            .select("*") \
+        stats_result = await supabase.table("tweet_daily_stats") \
+            .select("day,tweet_count,total_score") \
             .eq("user_id", user_id) \
-            .gte("created_at", start_date) \
-            .order("created_at", desc=False) \
+            .gt("day", start_day) \
+            .order("day", desc=False) \
             .execute()
 
-        tweets = tweets_result.data or []
-
-        # Group by date
-        daily_data = {}
-        for tweet in tweets:
-            created_at = tweet.get("created_at", "")
-            if created_at:
-                date = created_at.split("T")[0]
-                if date not in daily_data:
-                    daily_data[date] = {
-                        "date": date,
-                        "count": 0,
-                        "total_score": 0,
-                    }
-                daily_data[date]["count"] += 1
-                score = tweet.get("analysis", {}).get("score", 0) or 0
-                daily_data[date]["total_score"] += score
-
-        # Calculate averages and format response
-        performance_data = []
-        for date, data in sorted(daily_data.items()):
-            performance_data.append({
-                "date": date,
-                "count": data["count"],
-                "avg_score": round(data["total_score"] / data["count"], 1) if data["count"] > 0 else 0,
-            })
-
-        return performance_data
+        return [
+            {
+                "date": row["day"],
+                "count": row["tweet_count"],
+                "avg_score": round(float(row["total_score"]) / row["tweet_count"], 1) if row["tweet_count"] > 0 else 0,
+            }
+            for row in stats_result.data or []
+        ]
 
     except Exception as e:
         raise HTTPException(
@@ -20,6 +20,7 @@ from app.services.analyzer import (
     TweetCredAnalyzer,
     MonetizationAnalyzer,
 )
+from app.services.profile_cache import get_profile_cache
 
 router = APIRouter()
 
@@ -31,7 +32,7 @@ async def get_profile(
 ):
     """Get current user's profile."""
     try:
-        result = supabase.table("profiles") \
+        result = await supabase.table("profiles") \
             .select("*") \
             .eq("id", user_id) \
             .single() \
@@ -47,7 +48,8 @@ async def get_profile(
                 "total_posts": 0,
                 "avg_like_rate": 0.01,
             }
-            supabase.table("profiles").insert(profile_data).execute()
+            await supabase.table("profiles").insert(profile_data).execute()
+            get_profile_cache().invalidate(user_id)
             return ProfileResponse(**profile_data, created_at=None, updated_at=None)
 
         return result.data
@@ -67,7 +69,7 @@ async def update_profile(
     """Update current user's profile."""
     try:
         # Check if profile exists
-        existing = supabase.table("profiles") \
+        existing = await supabase.table("profiles") \
             .select("*") \
             .eq("id", user_id) \
             .single() \
@@ -77,7 +79,7 @@ async def update_profile(
 
         if existing.data:
             # Update existing
-            result = supabase.table("profiles") \
+            result = await supabase.table("profiles") \
                 .update(update_data) \
                 .eq("id", user_id) \
                 .select("*") \
@@ -85,12 +87,13 @@ async def update_profile(
                 .execute()
         else:
             # Create new
-            result = supabase.table("profiles") \
+            result = await supabase.table("profiles") \
                 .insert({**update_data, "id": user_id}) \
                 .select("*") \
                 .single() \
                 .execute()
 
+        get_profile_cache().invalidate(user_id)
         return result.data
     except Exception as e:
         raise HTTPException(
@@ -129,7 +132,7 @@ async def analyze_style(
 
     # Save analysis to database
     try:
-        supabase.table("style_analyses").insert({
+        await supabase.table("style_analyses").insert({
             "user_id": user_id,
             "analysis_data": analysis.model_dump(),
         }).execute()
@@ -150,7 +153,7 @@ async def get_tweetcred(
     TweetCred is X's internal authority scoring system.
     """
     # Get profile
-    profile_result = supabase.table("profiles") \
+    profile_result = await supabase.table("profiles") \
         .select("*") \
         .eq("id", user_id) \
         .single() \
@@ -188,7 +191,7 @@ async def get_monetization(
     Estimates potential revenue from X ad revenue sharing.
     """
     # Get profile
-    profile_result = supabase.table("profiles") \
+    profile_result = await supabase.table("profiles") \
         .select("*") \
         .eq("id", user_id) \
         .single() \
@@ -46,7 +46,7 @@ async def schedule_tweet(
             )
 
         # Insert into database
-        result = supabase.table("tweets").insert({
+        result = await supabase.table("tweets").insert({
             "user_id": user_id,
             "content": request.content,
             "analysis": request.analysis,
@@ -80,7 +80,7 @@ async def get_upcoming_tweets(
     try:
         now = datetime.now(pytz.UTC).isoformat()
 
-        result = supabase.table("tweets") \
+        result = await supabase.table("tweets") \
             .select("*") \
             .eq("user_id", user_id) \
             .eq("status", "scheduled") \
@@ -125,7 +125,7 @@ async def update_scheduled_tweet(
                 detail="No updates provided"
             )
 
-        result = supabase.table("tweets") \
+        result = await supabase.table("tweets") \
             .update(update_data) \
             .eq("id", tweet_id) \
             .eq("user_id", user_id) \
@@ -159,7 +159,7 @@ async def delete_scheduled_tweet(
 ):
     """Delete a scheduled tweet."""
     try:
-        result = supabase.table("tweets") \
+        result = await supabase.table("tweets") \
             .delete() \
             .eq("id", tweet_id) \
             .eq("user_id", user_id) \
@@ -42,7 +42,7 @@ async def analyze_style(
 
     # Save analysis to database
     try:
-        supabase.table("style_analyses").insert({
+        await supabase.table("style_analyses").insert({
             "user_id": user_id,
             "analysis_data": analysis,
         }).execute()
@@ -63,7 +63,7 @@ async def get_my_style(
     Returns the most recent style analysis for the user.
     """
     try:
-        result = supabase.table("style_analyses") \
+        result = await supabase.table("style_analyses") \
             .select("*") \
             .eq("user_id", user_id) \
             .order("created_at", desc=True) \
@@ -101,7 +101,7 @@ async def generate_in_style(
     """
     # Get user's style analysis
     try:
-        result = supabase.table("style_analyses") \
+        result = await supabase.table("style_analyses") \
             .select("*") \
             .eq("user_id", user_id) \
             .order("created_at", desc=True) \
@@ -142,13 +142,7 @@ TWEET:
 """
 
     try:
-        response = claude.client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}],
-        )
-
-        content = response.content[0].text.strip()
+        content = (await claude.complete(prompt, max_tokens=2000)).strip()
 
         return {
             "content": content,
@@ -6,7 +6,9 @@ Thread generation and management.
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 
-from app.core.deps import SupabaseDep, UserDep, OptionalUserDep
+from app.core.deps import OptionalProfileDep
+from app.core.sse import sse_event, sse_response
+from app.services.analyzer import TweetAnalyzer
 from app.services.thread_generator import get_thread_generator
 from app.services.claude import ClaudeService
 
@@ -19,8 +21,8 @@ async def generate_thread(
     tweet_count: int = 7,
     style: str = "educational",
     language: str = "tr",
-    user_id: OptionalUserDep = None,
-    supabase: SupabaseDep = None,
+    fresh: bool = False,
+    profile_data: OptionalProfileDep = None,
 ):
     """
     Generate a tweet thread (multiple connected tweets).
@@ -29,16 +31,6 @@ async def generate_thread(
     """
     generator = get_thread_generator()
 
-    # Get user profile for personalization
-    profile_data = None
-    if user_id and supabase:
-        try:
-            profile_result = supabase.table("profiles").select("*").eq("id", user_id).single()
-            if profile_result.data:
-                profile_data = profile_result.data
-        except Exception:
-            pass
-
     # Generate thread
     tweets = await generator.generate_thread(
         topic=topic,
@@ -46,6 +38,7 @@ async def generate_thread(
         style=style,
         language=language,
         profile=profile_data,
+        fresh=fresh,
     )
 
     total_chars = sum(len(t) for t in tweets)
@@ -57,12 +50,62 @@ async def generate_thread(
     }
 
 
+@router.post("/generate/stream")
+async def generate_thread_stream(
+    topic: str,
+    tweet_count: int = 7,
+    style: str = "educational",
+    language: str = "tr",
+    fresh: bool = False,
+    profile_data: OptionalProfileDep = None,
+):
+    """
+    Generate a tweet thread, streamed as Server-Sent Events.
+
+    Emits `token` events ({"text": chunk}) as the model writes, then one
+    `done` event with the same body as /generate plus an `analyses` list
+    (one analysis per tweet). If the model fails after text has been sent,
+    an `error` event ({"detail": ...}) ends the stream.
+    """
+    generator = get_thread_generator()
+
+    async def events():
+        parts = []
+        try:
+            async for chunk in generator.stream_thread(
+                topic=topic,
+                tweet_count=tweet_count,
+                style=style,
+                language=language,
+                profile=profile_data,
+                fresh=fresh,
+            ):
+                parts.append(chunk)
+                yield sse_event("token", {"text": chunk})
+            tweets = generator.finish_thread("".join(parts), topic, tweet_count)
+        except Exception as e:
+            print(f"Thread generation failed: {e}")
+            if parts:
+                yield sse_event("error", {"detail": "Thread generation failed"})
+                return
+            tweets = generator.fallback_thread(topic, tweet_count)
+
+        analyses = TweetAnalyzer().analyze_batch(tweets, profile_data)
+        yield sse_event("done", {
+            "tweets": tweets,
+            "total_characters": sum(len(t) for t in tweets),
+            "tweet_count": len(tweets),
+            "analyses": [a.model_dump() for a in analyses],
+        })
+
+    return sse_response(events())
+
+
 @router.post("/from-tweet")
 async def thread_from_tweet(
     content: str,
     tweet_count: int = 5,
-    user_id: OptionalUserDep = None,
-    supabase: SupabaseDep = None,
+    profile_data: OptionalProfileDep = None,
 ):
     """
     Convert a single long tweet into a thread.
@@ -71,16 +114,6 @@ async def thread_from_tweet(
     """
     generator = get_thread_generator()
 
-    # Get user profile
-    profile_data = None
-    if user_id and supabase:
-        try:
-            profile_result = supabase.table("profiles").select("*").eq("id", user_id).single()
-            if profile_result.data:
-                profile_data = profile_result.data
-        except Exception:
-            pass
-
     # Generate thread from content
     tweets = await generator.expand_to_thread(
         content=content,
@@ -3,15 +3,20 @@ Tweet API routes.
 Generation, analysis, optimization, and rewriting.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from typing import Annotated, List, Optional
 
-from app.core.deps import SupabaseDep, UserDep, OptionalUserDep
+from app.core.deps import SupabaseDep, UserDep, OptionalUserDep, OptionalProfileDep
+from app.core.pagination import decode_cursor, encode_cursor, etag_matches, page_etag
+from app.core.sse import sse_event, sse_response
 from app.models.tweet import (
     TweetGenerateRequest,
     TweetGenerateResponse,
     TweetAnalysisRequest,
     TweetAnalysisResponse,
+    TweetBatchAnalysisRequest,
+    TweetBatchAnalysisResponse,
+    TweetCandidate,
     TweetOptimizeRequest,
     TweetRewriteRequest,
 )
@@ -26,26 +31,18 @@ async def generate_tweet(
     request: TweetGenerateRequest,
     supabase: SupabaseDep,
     user_id: OptionalUserDep = None,
+    profile_data: OptionalProfileDep = None,
 ):
     """
     Generate a tweet using AI.
 
+    With best_of > 1, generates that many candidates in a single model call,
+    scores them locally and returns the best one plus the top_k candidates.
     Requires optional authentication for personalized results.
     """
     claude_service = ClaudeService()
 
-    # Get user profile if authenticated
-    profile_data = None
-    if user_id:
-        try:
-            profile_result = supabase.table("profiles").select("*").eq("id", user_id).single()
-            if profile_result.data:
-                profile_data = profile_result.data
-        except Exception:
-            pass
-
-    # Generate tweet
-    content = await claude_service.generate_tweet(
+    options = dict(
         topic=request.topic,
         style=request.style,
         tone=request.tone,
@@ -55,37 +52,113 @@ async def generate_tweet(
         include_emoji=request.include_emoji,
         custom_instructions=request.custom_instructions,
         profile=profile_data,
+        fresh=request.fresh,
     )
-
-    # Analyze the generated tweet
     analyzer = TweetAnalyzer()
-    analysis = analyzer.analyze(content, profile_data)
+
+    if request.best_of > 1:
+        # Best-of-N: one model call for all candidates, ranked locally by score
+        contents = await claude_service.generate_candidates(n=request.best_of, **options)
+        ranked = analyzer.rank(contents, profile_data, top_k=request.top_k)
+        content, analysis = ranked[0]
+        candidates = [
+            TweetCandidate(
+                rank=rank,
+                content=candidate,
+                analysis=candidate_analysis,
+                character_count=len(candidate),
+            )
+            for rank, (candidate, candidate_analysis) in enumerate(ranked, 1)
+        ]
+    else:
+        content = await claude_service.generate_tweet(**options)
+        analysis = analyzer.analyze(content, profile_data)
+        candidates = None
 
     # Save to database if authenticated
     if user_id:
-        try:
-            supabase.table("tweets").insert({
-                "user_id": user_id,
-                "content": content,
-                "analysis": analysis.model_dump(),
-                "status": "draft",
-            }).execute()
-        except Exception as e:
-            # Log error but don't fail the request
-            print(f"Failed to save tweet: {e}")
+        await _save_draft(supabase, user_id, content, analysis)
 
     return TweetGenerateResponse(
         content=content,
         analysis=analysis,
         character_count=len(content),
+        candidates=candidates,
     )
 
 
+@router.post("/generate/stream")
+async def generate_tweet_stream(
+    request: TweetGenerateRequest,
+    supabase: SupabaseDep,
+    user_id: OptionalUserDep = None,
+    profile_data: OptionalProfileDep = None,
+):
+    """
+    Generate a tweet using AI, streamed as Server-Sent Events.
+
+    Emits `token` events ({"text": chunk}) as the model writes, then one
+    `done` event with the same body as /generate. If the model fails after
+    text has been sent, an `error` event ({"detail": ...}) ends the stream.
+    """
+    claude_service = ClaudeService()
+
+    async def events():
+        parts = []
+        try:
+            async for chunk in claude_service.stream_tweet(
+                topic=request.topic,
+                style=request.style,
+                tone=request.tone,
+                length=request.length,
+                language=request.language,
+                include_cta=request.include_cta,
+                include_emoji=request.include_emoji,
+                custom_instructions=request.custom_instructions,
+                profile=profile_data,
+                fresh=request.fresh,
+            ):
+                parts.append(chunk)
+                yield sse_event("token", {"text": chunk})
+        except Exception as e:
+            print(f"Claude API error: {e}")
+            yield sse_event("error", {"detail": "Tweet generation failed"})
+            return
+
+        content = ClaudeService.clean_tweet("".join(parts))
+        analysis = TweetAnalyzer().analyze(content, profile_data)
+
+        if user_id:
+            await _save_draft(supabase, user_id, content, analysis)
+
+        response = TweetGenerateResponse(
+            content=content,
+            analysis=analysis,
+            character_count=len(content),
+        )
+        yield sse_event("done", response.model_dump())
+
+    return sse_response(events())
+
+
+async def _save_draft(supabase, user_id: str, content: str, analysis: TweetAnalysisResponse) -> None:
+    """Save a generated tweet as a draft; failures are logged, not raised."""
+    try:
+        await supabase.table("tweets").insert({
+            "user_id": user_id,
+            "content": content,
+            "analysis": analysis.model_dump(),
+            "status": "draft",
+        }).execute()
+    except Exception as e:
+        # Log error but don't fail the request
+        print(f"Failed to save tweet: {e}")
+
+
 @router.post("/analyze", response_model=TweetAnalysisResponse)
 async def analyze_tweet(
     request: TweetAnalysisRequest,
-    user_id: OptionalUserDep = None,
-    supabase: SupabaseDep = None,
+    profile_data: OptionalProfileDep = None,
 ):
     """
     Analyze a tweet using X's algorithm scoring system.
@@ -94,26 +167,33 @@ async def analyze_tweet(
     """
     analyzer = TweetAnalyzer()
 
-    # Get user profile if available for personalized analysis
-    profile_data = None
-    if user_id and supabase:
-        try:
-            profile_result = supabase.table("profiles").select("*").eq("id", user_id).single()
-            if profile_result.data:
-                profile_data = profile_result.data
-        except Exception:
-            pass
-
     analysis = analyzer.analyze(request.content, profile_data)
 
     return analysis
 
 
+@router.post("/analyze/batch", response_model=TweetBatchAnalysisResponse)
+async def analyze_tweets_batch(
+    request: TweetBatchAnalysisRequest,
+    profile_data: OptionalProfileDep = None,
+):
+    """
+    Analyze many tweets in one request.
+
+    The user profile is loaded once for the whole batch. Each result is
+    identical to what /analyze returns for the same content.
+    """
+    analyzer = TweetAnalyzer()
+
+    results = analyzer.analyze_batch(request.contents, profile_data)
+
+    return TweetBatchAnalysisResponse(results=results, count=len(results))
+
+
 @router.post("/optimize", response_model=TweetGenerateResponse)
 async def optimize_tweet(
     request: TweetOptimizeRequest,
-    user_id: OptionalUserDep = None,
-    supabase: SupabaseDep = None,
+    profile_data: OptionalProfileDep = None,
 ):
     """
     Optimize a tweet to improve its algorithm score.
@@ -122,16 +202,6 @@ async def optimize_tweet(
     """
     analyzer = TweetAnalyzer()
 
-    # Get user profile
-    profile_data = None
-    if user_id and supabase:
-        try:
-            profile_result = supabase.table("profiles").select("*").eq("id", user_id).single()
-            if profile_result.data:
-                profile_data = profile_result.data
-        except Exception:
-            pass
-
     # Analyze original
     original_analysis = analyzer.analyze(request.content, profile_data)
 
@@ -165,8 +235,7 @@ async def optimize_tweet(
 @router.post("/rewrite", response_model=TweetGenerateResponse)
 async def rewrite_tweet(
     request: TweetRewriteRequest,
-    user_id: OptionalUserDep = None,
-    supabase: SupabaseDep = None,
+    profile_data: OptionalProfileDep = None,
 ):
     """
     Rewrite a tweet in a different style.
@@ -176,21 +245,12 @@ async def rewrite_tweet(
     claude_service = ClaudeService()
     analyzer = TweetAnalyzer()
 
-    # Get user profile
-    profile_data = None
-    if user_id and supabase:
-        try:
-            profile_result = supabase.table("profiles").select("*").eq("id", user_id).single()
-            if profile_result.data:
-                profile_data = profile_result.data
-        except Exception:
-            pass
-
     # Rewrite using AI
     rewritten = await claude_service.rewrite_tweet(
         content=request.content,
         style=request.style,
         profile=profile_data,
+        fresh=request.fresh,
     )
 
     # Analyze rewritten version
@@ -203,29 +263,94 @@ async def rewrite_tweet(
     )
 
 
+# Columns that GET / can project with `fields=`
+TWEET_FIELDS = (
+    "id", "content", "analysis", "status", "scheduled_for", "posted_at",
+    "created_at", "updated_at", "score", "pred_favorite", "pred_reply",
+    "pred_repost", "pred_quote", "pred_follow_author",
+)
+
+
+def _select_columns(fields: Optional[str]) -> str:
+    """Validate a `fields=` list; id and created_at are always selected (cursor keys)."""
+    if not fields:
+        return "*"
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(requested) - set(TWEET_FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return ",".join(dict.fromkeys(["id", "created_at", *requested]))
+
+
 @router.get("/")
 async def get_tweets(
+    response: Response,
     user_id: UserDep,
     supabase: SupabaseDep,
-    limit: int = 50,
-    offset: int = 0,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    min_score: Optional[float] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
-    """Get user's saved tweets."""
+    """
+    Get user's saved tweets, newest first.
+
+    Pages are keyset-paginated on (created_at, id): pass the X-Next-Cursor
+    header of one page as `cursor` to get the next (no header = last page).
+    `offset` still works without a cursor but slows down with depth.
+    `fields` is a comma-separated column list. min_score keeps only analyzed
+    tweets scoring at least that much. Responses carry an ETag; a matching
+    If-None-Match gets 304 Not Modified with no body.
+    """
+    columns = _select_columns(fields)
+    after = decode_cursor(cursor) if cursor else None
+
     try:
-        result = supabase.table("tweets") \
-            .select("*") \
-            .eq("user_id", user_id) \
+        query = supabase.table("tweets") \
+            .select(columns) \
+            .eq("user_id", user_id)
+        if min_score is not None:
+            query = query.gte("score", min_score)
+        if after:
+            created_at, row_id = after
+            query = query.or_(
+                f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id})'
+            )
+            start = 0
+        else:
+            start = offset
+
+        # One extra row tells whether another page follows
+        result = await query \
             .order("created_at", desc=True) \
-            .range(offset, offset + limit - 1) \
+            .order("id", desc=True) \
+            .range(start, start + limit) \
             .execute()
-
-        return result.data
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch tweets: {str(e)}"
         )
 
+    rows = result.data or []
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    rows = rows[:limit]
+
+    etag = page_etag(rows, next_cursor)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return rows
+
 
 @router.get("/{tweet_id}")
 async def get_tweet(
@@ -235,7 +360,7 @@ async def get_tweet(
 ):
     """Get a specific tweet by ID."""
     try:
-        result = supabase.table("tweets") \
+        result = await supabase.table("tweets") \
             .select("*") \
             .eq("id", tweet_id) \
             .eq("user_id", user_id) \
@@ -0,0 +1,168 @@
+"""
+Local verification of Supabase access tokens.
+
+Tokens are checked in-process with python-jose instead of calling
+``auth.get_user`` on every request: HS256 tokens against the project's JWT
+secret, asymmetric tokens (RS256/ES256) against the project's JWKS, which is
+fetched once and cached. Verified tokens are kept in a small LRU cache until
+their ``exp``, so repeat requests skip signature checks entirely.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import httpx
+from jose import JOSEError, jwt
+
+from app.core.config import settings
+
+# Accepted signing algorithms (Supabase legacy secret / asymmetric signing keys)
+SECRET_ALGORITHM = "HS256"
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+# Key refresh settings
+JWKS_MIN_REFRESH_SECONDS = 30.0  # Unknown `kid`s refetch the JWKS at most this often
+JWKS_TIMEOUT_SECONDS = 5.0
+
+
+class TokenVerifier:
+    """
+    Thread-safe local JWT verifier with an LRU cache of verified tokens.
+
+    verify() returns the user ID for a valid token, raises JOSEError for an
+    invalid or expired one, and returns None when the token cannot be checked
+    locally (no secret configured, or its key is not in the JWKS).
+    """
+
+    def __init__(
+        self,
+        secret: str = "",
+        jwks_url: Optional[str] = None,
+        audience: Optional[str] = None,
+        max_entries: int = 4096,
+        jwks_ttl: float = 600.0,
+    ):
+        self.secret = secret
+        self.jwks_url = jwks_url
+        self.audience = audience
+        self.max_entries = max_entries
+        self.jwks_ttl = jwks_ttl
+        self._tokens: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._jwks: Dict[str, Dict] = {}
+        self._jwks_fetched_at: Optional[float] = None
+
+    def cached(self, token: str) -> Optional[str]:
+        """Return the user ID of a previously verified, unexpired token."""
+        with self._lock:
+            entry = self._tokens.get(token)
+            if entry is None:
+                return None
+            user_id, exp = entry
+            if exp <= time.time():
+                del self._tokens[token]
+                return None
+            self._tokens.move_to_end(token)
+            return user_id
+
+    def remember(self, token: str, user_id: str, exp: float) -> None:
+        """Cache a verified token until its expiry."""
+        if exp <= time.time():
+            return
+        with self._lock:
+            self._tokens[token] = (user_id, exp)
+            self._tokens.move_to_end(token)
+            while len(self._tokens) > self.max_entries:
+                self._tokens.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    async def verify(self, token: str) -> Optional[str]:
+        """
+        Verify a token locally.
+
+        Returns:
+            The token's `sub` (user ID), or None when it can't be checked locally
+
+        Raises:
+            JOSEError: Bad signature, wrong audience, expired or malformed token
+        """
+        user_id = self.cached(token)
+        if user_id is not None:
+            return user_id
+
+        header = jwt.get_unverified_header(token)
+        algorithm = header.get("alg")
+        if algorithm == SECRET_ALGORITHM:
+            key = self.secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            key = await self._signing_key(header.get("kid"))
+            if key and key.get("alg", algorithm) != algorithm:
+                raise JOSEError("Token algorithm does not match its signing key")
+        else:
+            return None
+        if not key:
+            return None
+
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=self.audience,
+            options={"verify_aud": self.audience is not None, "require_exp": True, "require_sub": True},
+        )
+        self.remember(token, claims["sub"], float(claims["exp"]))
+        return claims["sub"]
+
+    async def _signing_key(self, kid: Optional[str]) -> Optional[Dict]:
+        """Look up a JWKS key by `kid`, refetching the key set when stale or unknown."""
+        if not self.jwks_url:
+            return None
+        now = time.time()
+        age = now - self._jwks_fetched_at if self._jwks_fetched_at is not None else None
+        if age is None or age >= self.jwks_ttl or (kid not in self._jwks and age >= JWKS_MIN_REFRESH_SECONDS):
+            await self._refresh_jwks()
+        return self._jwks.get(kid)
+
+    async def _refresh_jwks(self) -> None:
+        """Fetch the JWKS; on failure keep the previous keys."""
+        self._jwks_fetched_at = time.time()
+        try:
+            async with httpx.AsyncClient(timeout=JWKS_TIMEOUT_SECONDS) as client:
+                response = await client.get(self.jwks_url)
+                response.raise_for_status()
+                keys = response.json().get("keys", [])
+        except Exception as e:
+            print(f"[Auth] JWKS fetch failed: {e}")
+            return
+        self._jwks = {key.get("kid"): key for key in keys}
+
+    @staticmethod
+    def expiry(token: str) -> Optional[float]:
+        """Read `exp` without verifying (for tokens already verified remotely)."""
+        try:
+            exp = jwt.get_unverified_claims(token).get("exp")
+        except JOSEError:
+            return None
+        return float(exp) if exp is not None else None
+
+
+# Singleton instance
+_token_verifier: Optional[TokenVerifier] = None
+
+
+def get_token_verifier() -> TokenVerifier:
+    """Get or create the shared token verifier."""
+    global _token_verifier
+    if _token_verifier is None:
+        _token_verifier = TokenVerifier(
+            secret=settings.SUPABASE_JWT_SECRET,
+            jwks_url=f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json",
+            audience=settings.SUPABASE_JWT_AUDIENCE or None,
+            max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+            jwks_ttl=settings.SUPABASE_JWKS_TTL_SECONDS,
+        )
+    return _token_verifier
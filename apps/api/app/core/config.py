@@ -22,9 +22,23 @@ class Settings(BaseSettings):
     # Supabase
     SUPABASE_URL: str
     SUPABASE_SERVICE_ROLE_KEY: str
+    SUPABASE_JWT_SECRET: str = ""  # Legacy HS256 secret; empty = verify via JWKS only
+    SUPABASE_JWT_AUDIENCE: str = "authenticated"
+    SUPABASE_JWKS_TTL_SECONDS: int = 10 * 60
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 4096
+    AUTH_REMOTE_FALLBACK: bool = True  # Ask Supabase Auth when a token can't be verified locally
 
     # Anthropic Claude
     ANTHROPIC_API_KEY: str = ""
+    CLAUDE_MODEL: str = "claude-3-5-sonnet-20241022"
+    CLAUDE_MAX_CONCURRENCY: int = 8  # In-flight Claude calls per worker
+    CLAUDE_TIMEOUT_SECONDS: float = 60.0  # Streaming: max wait for the next chunk
+    CLAUDE_COMPLETE_TIMEOUT_SECONDS: float = 600.0  # Non-streaming floor per attempt (SDK default)
+    CLAUDE_MIN_TOKENS_PER_SECOND: float = 10.0  # Non-streaming timeouts allow max_tokens at this rate
+    CLAUDE_MAX_RETRIES: int = 3
+    CLAUDE_RETRY_BASE_DELAY: float = 0.5  # seconds, doubled per retry (full jitter)
+    CLAUDE_RETRY_MAX_DELAY: float = 8.0
+    CLAUDE_RETRY_AFTER_MAX_SECONDS: float = 60.0  # Give up instead of waiting out a longer retry-after
 
     # Security - SECRET_KEY must be set in environment
     SECRET_KEY: str = ""
@@ -50,6 +64,20 @@ class Settings(BaseSettings):
     # Scheduling
     SCHEDULER_TIMEZONE: str = "Europe/Istanbul"
 
+    # Scraped timeline cache
+    TIMELINE_CACHE_TTL_SECONDS: int = 15 * 60
+    TIMELINE_CACHE_MAX_ENTRIES: int = 256
+    TIMELINE_CACHE_DB_PATH: str = ""  # Optional SQLite file; empty = memory only
+
+    # Per-user profile cache for personalization (invalidated on profile update)
+    PROFILE_CACHE_TTL_SECONDS: int = 60
+    PROFILE_CACHE_MAX_ENTRIES: int = 4096
+
+    # Claude generation cache (keyed by model + rendered prompt)
+    GENERATION_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    GENERATION_CACHE_MAX_ENTRIES: int = 1024  # SQLite store is trimmed to this on each periodic purge
+    GENERATION_CACHE_DB_PATH: str = ""  # Optional SQLite file; empty = in-memory LRU
+
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
@@ -2,32 +2,41 @@
 Dependency injection utilities.
 """
 
-from typing import Annotated, Generator
-from fastapi import Depends, Header, HTTPException, status
-from supabase import create_client, Client
+from typing import Annotated, Any, Dict
+from fastapi import Depends, Header, HTTPException, Request, status
+from jose import JOSEError
+from supabase import AsyncClient
 
+from app.core.auth import get_token_verifier
 from app.core.config import settings
+from app.core.supabase import get_supabase_client
+from app.services.profile_cache import get_profile_cache
 
 
-async def get_supabase() -> Generator[Client, None, None]:
-    """Get Supabase client instance."""
-    client = create_client(
-        settings.SUPABASE_URL,
-        settings.SUPABASE_SERVICE_ROLE_KEY
-    )
-    try:
-        yield client
-    finally:
-        pass
+async def get_supabase(request: Request) -> AsyncClient:
+    """
+    Get the application-scoped Supabase client.
+
+    The client is created in the app lifespan and stored on app.state; it is
+    created on first use when the lifespan has not run.
+    """
+    client = getattr(request.app.state, "supabase", None)
+    return client if client is not None else await get_supabase_client()
+
+
+SupabaseDep = Annotated[AsyncClient, Depends(get_supabase)]
 
 
 async def verify_authorization(
-    authorization: Annotated[str | None, Header()] = None
+    supabase: SupabaseDep,
+    authorization: Annotated[str | None, Header()] = None,
 ) -> str:
     """
     Verify authorization header and extract user ID.
 
-    This validates the JWT token from Supabase and extracts the user ID.
+    The Supabase JWT is verified locally (project secret or cached JWKS) and
+    verified tokens are cached until they expire. Tokens that can't be checked
+    locally are verified with Supabase Auth when AUTH_REMOTE_FALLBACK is set.
     """
     if not authorization:
         raise HTTPException(
@@ -43,13 +52,27 @@ async def verify_authorization(
 
     token = authorization.split(" ")[1]
 
-    # Verify token with Supabase
+    # Verify token locally (cached until exp)
+    verifier = get_token_verifier()
     try:
-        client = create_client(
-            settings.SUPABASE_URL,
-            settings.SUPABASE_SERVICE_ROLE_KEY
+        user_id = await verifier.verify(token)
+    except JOSEError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Token validation failed: {str(e)}"
+        )
+    if user_id is not None:
+        return user_id
+
+    if not settings.AUTH_REMOTE_FALLBACK:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token validation failed: signing key unavailable"
         )
-        user = client.auth.get_user(token)
+
+    # Fall back to verifying with Supabase Auth
+    try:
+        user = await supabase.auth.get_user(token)
 
         if not user or not user.user:
             raise HTTPException(
@@ -57,8 +80,13 @@ async def verify_authorization(
                 detail="Invalid or expired token"
             )
 
+        exp = verifier.expiry(token)
+        if exp is not None:
+            verifier.remember(token, user.user.id, exp)
         return user.user.id
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -67,19 +95,37 @@ async def verify_authorization(
 
 
 async def get_optional_user_id(
-    authorization: Annotated[str | None, Header()] = None
+    supabase: SupabaseDep,
+    authorization: Annotated[str | None, Header()] = None,
 ) -> str | None:
     """Get user ID from authorization header if present."""
     if not authorization:
         return None
 
     try:
-        return await verify_authorization(authorization)
+        return await verify_authorization(supabase, authorization)
     except HTTPException:
         return None
 
 
+OptionalUserDep = Annotated[str | None, Depends(get_optional_user_id)]
+
+
+async def get_optional_profile(
+    supabase: SupabaseDep,
+    user_id: OptionalUserDep = None,
+) -> Dict[str, Any] | None:
+    """
+    Get the caller's profile fields used for personalization, if signed in.
+
+    Resolved once per request and served from the shared profile cache,
+    so back-to-back requests from the same user skip the database.
+    """
+    if not user_id:
+        return None
+    return await get_profile_cache().load(supabase, user_id)
+
+
 # Type aliases for dependencies
-SupabaseDep = Annotated[Client, Depends(get_supabase)]
 UserDep = Annotated[str, Depends(verify_authorization)]
-OptionalUserDep = Annotated[str | None, Depends(get_optional_user_id)]
+OptionalProfileDep = Annotated[Dict[str, Any] | None, Depends(get_optional_profile)]
@@ -0,0 +1,59 @@
+"""
+Keyset pagination cursors and page ETags for list endpoints.
+
+A cursor encodes the sort key of the last row on a page, (created_at, id),
+so the next page is an index range scan that stays equally fast at any
+depth, unlike OFFSET which re-reads every skipped row.
+"""
+
+import base64
+import hashlib
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Build an opaque cursor pointing just past `row`."""
+    raw = json.dumps([row["created_at"], row["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a cursor into (created_at, id).
+
+    Both parts are validated, since they end up in a PostgREST filter.
+
+    Raises:
+        HTTPException: 400 for a malformed cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        datetime.fromisoformat(created_at)
+        return created_at, str(uuid.UUID(row_id))
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def page_etag(data: Any, next_cursor: Optional[str] = None) -> str:
+    """Weak ETag over a page's content and its continuation."""
+    body = json.dumps([data, next_cursor], sort_keys=True, default=str, separators=(",", ":"))
+    return f'W/"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
@@ -0,0 +1,24 @@
+"""
+Server-Sent Events helpers for streaming responses.
+"""
+
+import json
+from typing import Any, AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+# Disable proxy buffering (e.g. nginx) so events reach the client immediately
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one SSE message with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap an async iterator of formatted SSE messages in a streaming response."""
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
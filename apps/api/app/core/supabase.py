@@ -0,0 +1,55 @@
+"""
+Application-scoped async Supabase client.
+
+One service-role client is created at startup and shared by every request.
+It is the async supabase-py client, so PostgREST and auth calls are awaited
+on the event loop over pooled connections instead of blocking the worker
+while a query runs. Must be created and used from the app's event loop.
+"""
+
+from typing import Optional
+
+from supabase import AsyncClient, AsyncClientOptions, acreate_client
+
+from app.core.config import settings
+
+
+async def create_supabase_client() -> AsyncClient:
+    """Create a service-role Supabase client that never holds a user session."""
+    return await acreate_client(
+        settings.SUPABASE_URL,
+        settings.SUPABASE_SERVICE_ROLE_KEY,
+        options=AsyncClientOptions(auto_refresh_token=False, persist_session=False),
+    )
+
+
+# Singleton instance
+_supabase_client: Optional[AsyncClient] = None
+
+
+async def get_supabase_client() -> AsyncClient:
+    """Get or create the shared Supabase client (call from the app's event loop)."""
+    global _supabase_client
+    if _supabase_client is None:
+        client = await create_supabase_client()
+        # Another request may have created one while we awaited
+        if _supabase_client is None:
+            _supabase_client = client
+        else:
+            await _close(client)
+    return _supabase_client
+
+
+async def close_supabase_client() -> None:
+    """Close the shared Supabase client's HTTP connections, if it was created."""
+    global _supabase_client
+    if _supabase_client is not None:
+        client, _supabase_client = _supabase_client, None
+        await _close(client)
+
+
+async def _close(client: AsyncClient) -> None:
+    # postgrest is created lazily; don't build it just to close it
+    if client._postgrest is not None:
+        await client._postgrest.aclose()
+    await client.auth.close()
@@ -11,6 +11,10 @@ import logging
 
 from app.api.v1 import tweets, profiles, threads, scheduling, analytics, ab_tests, style
 from app.core.config import settings
+from app.core.supabase import close_supabase_client, get_supabase_client
+from app.services.http_client import close_async_http_client, close_http_client
+from app.services.claude import close_async_client as close_claude_client
+from app.services.twitter_scraper import get_scraper
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +32,14 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
     logger.info("Starting X Tweet Generator API...")
+    app.state.supabase = await get_supabase_client()
+    scheduler.add_job(
+        get_scraper().probe_all,
+        "interval",
+        minutes=5,
+        id="scraper_health_probe",
+        replace_existing=True,
+    )
     scheduler.start()
     logger.info("Scheduler started")
 
@@ -37,6 +49,11 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down...")
     scheduler.shutdown()
     logger.info("Scheduler stopped")
+    close_http_client()
+    await close_async_http_client()
+    await close_claude_client()
+    app.state.supabase = None
+    await close_supabase_client()
 
 
 # Create FastAPI app
@@ -54,6 +71,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 
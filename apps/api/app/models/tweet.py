@@ -30,6 +30,11 @@ class TweetGenerateRequest(BaseModel):
     include_cta: Optional[bool] = Field(True, description="Include call to action")
     include_emoji: Optional[bool] = Field(True, description="Include emojis")
     custom_instructions: Optional[str] = Field(None, max_length=1000)
+    fresh: Optional[bool] = Field(False, description="Skip the generation cache and produce a new variant")
+    best_of: int = Field(
+        1, ge=1, le=4, description="Candidates generated in one call and ranked by score (best-of-N)"
+    )
+    top_k: int = Field(1, ge=1, le=4, description="Ranked candidates to return when best_of > 1")
 
 
 class TweetAnalysisRequest(BaseModel):
@@ -39,6 +44,14 @@ class TweetAnalysisRequest(BaseModel):
     include_predictions: Optional[bool] = Field(True, description="Include engagement predictions")
 
 
+class TweetBatchAnalysisRequest(BaseModel):
+    """Request model for batch tweet analysis."""
+
+    contents: List[str] = Field(
+        ..., min_length=1, max_length=1000, description="Tweet contents to analyze"
+    )
+
+
 class TweetOptimizeRequest(BaseModel):
     """Request model for tweet optimization."""
 
@@ -51,6 +64,7 @@ class TweetRewriteRequest(BaseModel):
 
     content: str = Field(..., min_length=1, max_length=25000, description="Tweet to rewrite")
     style: str = Field(..., description="Target style: viral, controversial, emotional, educational")
+    fresh: Optional[bool] = Field(False, description="Skip the generation cache and produce a new variant")
 
 
 class TweetGenerateResponse(BaseModel):
@@ -59,6 +73,18 @@ class TweetGenerateResponse(BaseModel):
     content: str = Field(..., description="Generated tweet content")
     analysis: Optional["TweetAnalysisResponse"] = None
     character_count: int = Field(..., description="Tweet character count")
+    candidates: Optional[List["TweetCandidate"]] = Field(
+        None, description="Top-k ranked candidates, best first (best-of-N only)"
+    )
+
+
+class TweetCandidate(BaseModel):
+    """A ranked best-of-N candidate."""
+
+    rank: int = Field(..., ge=1, description="1 = best")
+    content: str = Field(..., description="Candidate tweet content")
+    analysis: "TweetAnalysisResponse"
+    character_count: int = Field(..., description="Tweet character count")
 
 
 class TweetAnalysisResponse(BaseModel):
@@ -72,6 +98,13 @@ class TweetAnalysisResponse(BaseModel):
     profile_boost: float = Field(1.0, description="Profile-based multiplier")
 
 
+class TweetBatchAnalysisResponse(BaseModel):
+    """Response model for batch tweet analysis."""
+
+    results: List[TweetAnalysisResponse] = Field(..., description="Analyses in input order")
+    count: int = Field(..., description="Number of analyzed tweets")
+
+
 class EngagementPrediction(BaseModel):
     """Engagement prediction model."""
 
@@ -100,3 +133,5 @@ class ThreadGenerateResponse(BaseModel):
 
 # Update forward references
 TweetGenerateResponse.model_rebuild()
+TweetCandidate.model_rebuild()
+TweetBatchAnalysisResponse.model_rebuild()
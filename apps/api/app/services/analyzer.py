@@ -4,7 +4,7 @@ Implements X's algorithm scoring system.
 """
 
 import re
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -39,6 +39,12 @@ HOURLY_ENGAGEMENT_MULTIPLIERS = {
     18: 1.3, 19: 1.4, 20: 1.3, 21: 1.2, 22: 0.9, 23: 0.6,
 }
 
+# Precompiled content patterns (shared by single and batch analysis)
+HASHTAG_PATTERN = re.compile(r"#\w+")
+MENTION_PATTERN = re.compile(r"@\w+")
+LINK_PATTERN = re.compile(r"https?://")
+EMOJI_PATTERN = re.compile(r"[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F700-\U0001F77F\U0001F780-\U0001F7FF\U0001F800-\U0001F8FF\U0001F900-\U0001F9FF\U0001FA00-\U0001FA6F\U0001FA70-\U0001FAFF\U00002702-\U000027B0\U000024C2-\U0001F251]")
+
 
 class TweetAnalyzer:
     """Analyzes tweets using X's algorithm scoring system."""
@@ -52,6 +58,7 @@ class TweetAnalyzer:
             "what do you think", "thoughts", "agree", "disagree",
             "?", "🤔", "💭", "👇",
         ]
+        self._viral_keywords_lower = [kw.lower() for kw in self.keywords_viral]
 
     def analyze(self, content: str, profile: Optional[Dict] = None) -> TweetAnalysisResponse:
         """
@@ -64,6 +71,78 @@ class TweetAnalyzer:
         Returns:
             TweetAnalysisResponse with score, predictions, and suggestions
         """
+        return self._analyze(content, self._profile_boost(profile))
+
+    def analyze_batch(
+        self,
+        contents: Iterable[str],
+        profile: Optional[Dict] = None,
+    ) -> List[TweetAnalysisResponse]:
+        """
+        Analyze many tweets for the same user in one call.
+
+        The profile boost is computed once per batch and repeated drafts
+        are scored once. Each result matches analyze() for the same input.
+
+        Args:
+            contents: Tweet contents to analyze
+            profile: Optional user profile for personalization
+
+        Returns:
+            List of TweetAnalysisResponse in input order
+        """
+        profile_boost = self._profile_boost(profile)
+        seen: Dict[str, TweetAnalysisResponse] = {}
+        results = []
+
+        for content in contents:
+            analysis = seen.get(content)
+            if analysis is None:
+                analysis = seen[content] = self._analyze(content, profile_boost)
+            else:
+                analysis = analysis.model_copy(deep=True)
+            results.append(analysis)
+
+        return results
+
+    def rank(
+        self,
+        contents: List[str],
+        profile: Optional[Dict] = None,
+        top_k: Optional[int] = None,
+    ) -> List[Tuple[str, TweetAnalysisResponse]]:
+        """
+        Score candidates in one batched pass and sort them best first.
+
+        Ties on score keep the input order.
+
+        Args:
+            contents: Candidate tweet contents
+            profile: Optional user profile for personalization
+            top_k: Number of candidates to keep (None = all)
+
+        Returns:
+            List of (content, analysis) pairs, best first
+        """
+        analyses = self.analyze_batch(contents, profile)
+        order = sorted(range(len(contents)), key=lambda i: (-analyses[i].score, i))
+        return [(contents[i], analyses[i]) for i in order[:top_k]]
+
+    def _profile_boost(self, profile: Optional[Dict]) -> float:
+        """Calculate the profile-based score multiplier."""
+        profile_boost = 1.0
+        if profile:
+            if profile.get("verified"):
+                profile_boost += 0.2
+            followers = profile.get("followers", 0)
+            if followers >= 10000:
+                profile_boost += 0.1
+            elif followers >= 100000:
+                profile_boost += 0.2
+        return profile_boost
+
+    def _analyze(self, content: str, profile_boost: float) -> TweetAnalysisResponse:
+        """Score a single tweet with a precomputed profile boost."""
         # Calculate base score
         score = 50.0  # Start at neutral
 
@@ -93,7 +172,7 @@ class TweetAnalyzer:
             suggestions.append("Add a question to boost replies")
 
         # Hashtag analysis
-        hashtags = re.findall(r"#\w+", content)
+        hashtags = HASHTAG_PATTERN.findall(content)
         if 1 <= len(hashtags) <= 2:
             score += 5
             strengths.append("Good hashtag usage")
@@ -102,7 +181,7 @@ class TweetAnalyzer:
             weaknesses.append("Too many hashtags reduces reach")
 
         # Mention analysis
-        mentions = re.findall(r"@\w+", content)
+        mentions = MENTION_PATTERN.findall(content)
         if 1 <= len(mentions) <= 3:
             score += 10
             strengths.append("Strategic mentions increase reach")
@@ -111,14 +190,14 @@ class TweetAnalyzer:
             weaknesses.append("Too many mentions may look spammy")
 
         # Link analysis
-        has_link = bool(re.search(r"https?://", content))
+        has_link = bool(LINK_PATTERN.search(content))
         if has_link:
             score -= 10
             weaknesses.append("External links reduce X algorithm reach")
             suggestions.append("Consider using thread or putting link in comments")
 
         # Emoji analysis
-        emojis = len(re.findall(r"[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F700-\U0001F77F\U0001F780-\U0001F7FF\U0001F800-\U0001F8FF\U0001F900-\U0001F9FF\U0001FA00-\U0001FA6F\U0001FA70-\U0001FAFF\U00002702-\U000027B0\U000024C2-\U0001F251]", content))
+        emojis = len(EMOJI_PATTERN.findall(content))
         if 1 <= emojis <= 3:
             score += 5
             strengths.append("Appropriate emoji usage")
@@ -127,7 +206,8 @@ class TweetAnalyzer:
             weaknesses.append("Too many emojis")
 
         # Viral keyword analysis
-        has_viral_keyword = any(kw.lower() in content.lower() for kw in self.keywords_viral)
+        content_lower = content.lower()
+        has_viral_keyword = any(kw in content_lower for kw in self._viral_keywords_lower)
         if has_viral_keyword:
             score += 10
             strengths.append("Contains viral-trigger keywords")
@@ -141,17 +221,6 @@ class TweetAnalyzer:
         # Calculate engagement prediction
         prediction = self._predict_engagement(score, content)
 
-        # Apply profile boost if available
-        profile_boost = 1.0
-        if profile:
-            if profile.get("verified"):
-                profile_boost += 0.2
-            followers = profile.get("followers", 0)
-            if followers >= 10000:
-                profile_boost += 0.1
-            elif followers >= 100000:
-                profile_boost += 0.2
-
         # Final score with profile boost
         final_score = min(100, score * profile_boost)
 
@@ -184,7 +253,7 @@ class TweetAnalyzer:
         # Adjust based on content
         if "?" in content:
             base_rate *= 1.2  # Questions get more replies
-        if re.search(r"https?://", content):
+        if LINK_PATTERN.search(content):
             base_rate *= 0.7  # Links reduce engagement
 
         return EngagementPrediction(
@@ -0,0 +1,195 @@
+"""
+Asyncio-native Twitter/X scraper.
+
+Same sources, fallback order and result shape as TwitterScraper, but all
+network I/O goes through a shared httpx.AsyncClient so scrapes never block
+the event loop. Many usernames can be scraped concurrently under a global
+concurrency limit.
+"""
+
+import asyncio
+import time
+from contextlib import aclosing
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from app.services.http_client import AsyncPooledHTTPClient, get_async_http_client
+from app.services.instance_health import InstanceHealthRegistry, get_instance_health, is_host_failure
+from app.services.timeline_cache import TimelineCache, get_timeline_cache
+from app.services.twitter_scraper import (
+    DEFAULT_HEADERS,
+    SYNDICATION_HEADERS,
+    SYNDICATION_URL,
+    ScrapedTweet,
+    SyndicationTimelineParser,
+    TimelineParser,
+    TwitterScraper,
+    timeline_parser_for,
+    to_tweet_dicts,
+)
+
+# Maximum number of usernames scraped at the same time
+MAX_CONCURRENT_SCRAPES = 8
+
+
+class AsyncTwitterScraper:
+    """
+    Async Twitter/X scraper - No API key required.
+
+    Shares the timeline cache and mirror health registry with TwitterScraper.
+    """
+
+    ALTERNATIVE_INSTANCES = TwitterScraper.ALTERNATIVE_INSTANCES
+    SYNDICATION_HOST = TwitterScraper.SYNDICATION_HOST
+
+    def __init__(
+        self,
+        http_client: Optional[AsyncPooledHTTPClient] = None,
+        cache: Optional[TimelineCache] = None,
+        health: Optional[InstanceHealthRegistry] = None,
+        max_concurrency: int = MAX_CONCURRENT_SCRAPES,
+    ):
+        self._http = http_client
+        self.cache = cache if cache is not None else get_timeline_cache()
+        self.health = health or get_instance_health()
+        self.headers = dict(DEFAULT_HEADERS)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def http(self) -> AsyncPooledHTTPClient:
+        # Created lazily so the client binds to the running event loop
+        if self._http is None:
+            self._http = get_async_http_client()
+        return self._http
+
+    async def _tracked_parse(
+        self,
+        url: str,
+        parser: TimelineParser,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 15,
+    ) -> TimelineParser:
+        """
+        Stream a page into an incremental parser, recording host health.
+
+        Stops reading as soon as the parser has what it needs.
+        """
+        host = urlsplit(url).netloc
+        if not self.health.is_available(host):
+            raise ConnectionError(f"{host} circuit open")
+        start = time.monotonic()
+        try:
+            async with aclosing(self.http.aiter_text(url, headers=headers or self.headers, timeout=timeout)) as chunks:
+                async for chunk in chunks:
+                    parser.feed(chunk)
+                    if parser.finished:
+                        break
+                else:
+                    parser.close()
+        except Exception as e:
+            if is_host_failure(e):
+                self.health.record_failure(host, str(e))
+            else:
+                # The host answered; only this request failed
+                self.health.record_success(host, time.monotonic() - start)
+            raise
+        self.health.record_success(host, time.monotonic() - start)
+        return parser
+
+    async def fetch_tweets_syndication(self, username: str, count: int = 50) -> List[ScrapedTweet]:
+        """Fetch tweets using the Twitter Syndication API."""
+        try:
+            parser = await self._tracked_parse(
+                SYNDICATION_URL.format(username=username),
+                SyndicationTimelineParser(count),
+                headers={**self.headers, **SYNDICATION_HEADERS},
+                timeout=15,
+            )
+            return parser.tweets
+        except Exception as e:
+            print(f"[Syndication] Failed: {e}")
+        return []
+
+    async def fetch_tweets_instance(self, username: str, instance: str, count: int = 50) -> List[ScrapedTweet]:
+        """Fetch tweets from an xcancel-style or Nitter instance."""
+        try:
+            parser = await self._tracked_parse(
+                f"https://{instance}/{username}",
+                timeline_parser_for(instance, count),
+                timeout=15,
+            )
+            return parser.tweets
+        except Exception as e:
+            print(f"[{instance}] Failed: {e}")
+        return []
+
+    async def fetch_tweets(self, username: str, count: int = 50, force_refresh: bool = False) -> List[Dict]:
+        """
+        Fetch tweets for one username.
+
+        Serves a fresh cached timeline when available, otherwise tries each
+        method until one succeeds. Returns the same tweet dictionaries as
+        TwitterScraper.fetch_tweets.
+        """
+        username = username.lstrip("@").strip()
+        if not force_refresh:
+            cached = await self.cache.aget(username, count)
+            if cached is not None:
+                return cached.tweets
+
+        async with self._semaphore:
+            tweets, method = await self._fetch_tweets_uncached(username, count)
+
+        if tweets:
+            await self.cache.aset(username, count, tweets, method)
+        return tweets
+
+    async def _fetch_tweets_uncached(self, username: str, count: int) -> Tuple[List[Dict], Optional[str]]:
+        """Try syndication, then instances in health order."""
+        tweets = await self.fetch_tweets_syndication(username, count)
+        if tweets:
+            return to_tweet_dicts(tweets), "syndication"
+
+        for instance in self.health.ordered(self.ALTERNATIVE_INSTANCES):
+            tweets = await self.fetch_tweets_instance(username, instance, count)
+            if tweets:
+                return to_tweet_dicts(tweets), instance
+
+        return [], None
+
+    async def fetch_many(
+        self,
+        usernames: List[str],
+        count: int = 50,
+        force_refresh: bool = False,
+    ) -> Dict[str, List[Dict]]:
+        """
+        Scrape several usernames concurrently.
+
+        At most max_concurrency scrapes hit the network at once. Results are
+        keyed by normalized username; a failed scrape yields an empty list.
+        """
+        names = list(dict.fromkeys(u.lstrip("@").strip() for u in usernames if u.strip()))
+        results = await asyncio.gather(
+            *(self.fetch_tweets(name, count, force_refresh) for name in names),
+            return_exceptions=True,
+        )
+        out = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                print(f"[AsyncScraper] {name} failed: {result}")
+                result = []
+            out[name] = result
+        return out
+
+
+# Singleton instance
+_async_scraper: Optional[AsyncTwitterScraper] = None
+
+
+def get_async_scraper() -> AsyncTwitterScraper:
+    """Get or create async scraper singleton."""
+    global _async_scraper
+    if _async_scraper is None:
+        _async_scraper = AsyncTwitterScraper()
+    return _async_scraper
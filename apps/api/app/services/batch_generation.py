@@ -0,0 +1,200 @@
+"""
+Offline batch tweet generation via Anthropic Message Batches.
+
+Topics and options are read from a CSV or JSONL file, submitted as a single
+batch, polled until the batch ends, and written back with each generated
+tweet and its analysis. Batches trade latency (up to 24 hours) for half the
+per-token price, which suits overnight draft generation.
+
+Run from the apps/api directory:
+
+    python -m app.services.batch_generation topics.csv drafts.jsonl
+"""
+
+import asyncio
+import csv
+import json
+from typing import AsyncIterator, Callable, Dict, List, Optional, Protocol, Tuple
+
+# Request fields accepted per row, besides "id" and "topic"
+BATCH_OPTION_KEYS = ("style", "tone", "length", "language", "include_cta", "include_emoji", "custom_instructions")
+BATCH_BOOL_KEYS = ("include_cta", "include_emoji")
+BATCH_POLL_INTERVAL = 60.0  # seconds
+BATCH_TIMEOUT = 24 * 60 * 60.0  # Message batches expire after 24 hours
+
+
+class BatchBackend(Protocol):
+    """Submits message batches and returns their results."""
+
+    async def submit(self, requests: List[Dict]) -> str: ...
+    async def is_done(self, batch_id: str) -> bool: ...
+    def results(self, batch_id: str) -> AsyncIterator[Tuple[str, Optional[str], Optional[str]]]: ...
+
+
+class AnthropicBatchBackend:
+    """Message Batches API backend on the shared AsyncAnthropic client."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def submit(self, requests: List[Dict]) -> str:
+        """Submit [{"custom_id", "params"}] requests and return the batch id."""
+        batch = await self.client.messages.batches.create(requests=requests)
+        return batch.id
+
+    async def is_done(self, batch_id: str) -> bool:
+        batch = await self.client.messages.batches.retrieve(batch_id)
+        return batch.processing_status == "ended"
+
+    async def results(self, batch_id: str) -> AsyncIterator[Tuple[str, Optional[str], Optional[str]]]:
+        """Yield (custom_id, text, error) for every request in the batch."""
+        async for entry in await self.client.messages.batches.results(batch_id):
+            result = entry.result
+            if result.type == "succeeded":
+                yield entry.custom_id, result.message.content[0].text, None
+            else:
+                error = getattr(result, "error", None)
+                yield entry.custom_id, None, str(error) if error else result.type
+
+
+class FakeBatchBackend:
+    """
+    Local batch backend that never calls the API, for tests and development.
+
+    `responder(params)` produces each reply; if it raises, that request is
+    reported as errored. A batch ends after `polls_until_done` status checks.
+    """
+
+    def __init__(
+        self,
+        responder: Optional[Callable[[Dict], str]] = None,
+        polls_until_done: int = 1,
+    ):
+        self.responder = responder or (lambda params: f"[fake] {params['messages'][-1]['content'][:80]}")
+        self.polls_until_done = polls_until_done
+        self.batches: Dict[str, Dict] = {}
+
+    async def submit(self, requests: List[Dict]) -> str:
+        batch_id = f"fake_batch_{len(self.batches) + 1}"
+        self.batches[batch_id] = {"requests": list(requests), "polls": 0}
+        return batch_id
+
+    async def is_done(self, batch_id: str) -> bool:
+        batch = self.batches[batch_id]
+        batch["polls"] += 1
+        return batch["polls"] >= self.polls_until_done
+
+    async def results(self, batch_id: str) -> AsyncIterator[Tuple[str, Optional[str], Optional[str]]]:
+        for request in self.batches[batch_id]["requests"]:
+            try:
+                yield request["custom_id"], self.responder(request["params"]), None
+            except Exception as e:
+                yield request["custom_id"], None, str(e)
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def load_batch_items(path: str) -> List[Dict]:
+    """
+    Read batch items from a CSV or JSONL file.
+
+    Every row needs a "topic"; "id" and the generate_tweet options in
+    BATCH_OPTION_KEYS are optional. Empty CSV cells fall back to defaults.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    items = []
+    for i, row in enumerate(rows):
+        topic = str(row.get("topic") or "").strip()
+        if not topic:
+            raise ValueError(f"{path}: row {i + 1} has no topic")
+        item = {"id": str(row.get("id") or i + 1), "topic": topic}
+        for key in BATCH_OPTION_KEYS:
+            value = row.get(key)
+            if value is None or value == "":
+                continue
+            item[key] = _parse_bool(value) if key in BATCH_BOOL_KEYS else value
+        items.append(item)
+    return items
+
+
+def write_batch_results(path: str, results: List[Dict]) -> None:
+    """Write batch results as JSONL, or CSV when the path ends in .csv."""
+    if path.lower().endswith(".csv"):
+        columns = ["id", "topic", *BATCH_OPTION_KEYS, "content", "score", "error", "analysis"]
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            for result in results:
+                analysis = result.get("analysis")
+                writer.writerow({
+                    **result,
+                    "score": analysis["score"] if analysis else "",
+                    "analysis": json.dumps(analysis, ensure_ascii=False) if analysis else "",
+                })
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+async def run_batch_file(
+    input_path: str,
+    output_path: str,
+    backend: Optional[BatchBackend] = None,
+    poll_interval: float = BATCH_POLL_INTERVAL,
+    timeout: float = BATCH_TIMEOUT,
+    cache_results: Optional[bool] = None,
+) -> Dict:
+    """
+    Generate tweets for every item in `input_path` as one batch.
+
+    Each output row is the input item plus "content", "analysis" (the
+    TweetAnalyzer result) and "error". Returns a summary with the batch id
+    and success/failure counts. `cache_results` is passed to
+    ClaudeService.generate_batch.
+    """
+    # Imported here so the file helpers above work without app settings
+    from app.services.analyzer import TweetAnalyzer
+    from app.services.claude import ClaudeService
+
+    items = load_batch_items(input_path)
+    batch_id, results = await ClaudeService().generate_batch(
+        items, backend=backend, poll_interval=poll_interval, timeout=timeout,
+        cache_results=cache_results,
+    )
+
+    analyzer = TweetAnalyzer()
+    for result in results:
+        content = result.get("content")
+        result["analysis"] = analyzer.analyze(content).model_dump() if content else None
+
+    write_batch_results(output_path, results)
+    succeeded = sum(1 for r in results if r["error"] is None)
+    return {
+        "batch_id": batch_id,
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate tweets offline with a message batch")
+    parser.add_argument("input", help="Topics file (.csv or .jsonl)")
+    parser.add_argument("output", help="Results file (.csv or .jsonl)")
+    parser.add_argument("--poll", type=float, default=BATCH_POLL_INTERVAL, help="Poll interval in seconds")
+    args = parser.parse_args()
+
+    print(asyncio.run(run_batch_file(args.input, args.output, poll_interval=args.poll)))
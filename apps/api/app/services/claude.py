@@ -2,22 +2,277 @@
 Claude AI service for tweet generation.
 """
 
+import asyncio
 import os
-from typing import Optional, Dict, Any
-from anthropic import Anthropic
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import anthropic
+from anthropic import AsyncAnthropic
 
 from app.core.config import settings
+from app.services.batch_generation import (
+    BATCH_POLL_INTERVAL,
+    BATCH_TIMEOUT,
+    AnthropicBatchBackend,
+    BatchBackend,
+)
+from app.services.generation_cache import GenerationCache, generation_cache_key, get_generation_cache
+
+# Errors worth retrying: timeouts, dropped connections, rate limits, 5xx/overloaded.
+# Newer SDKs raise OverloadedError (not InternalServerError) for 529.
+RETRYABLE_ERRORS = (
+    anthropic.APITimeoutError,
+    anthropic.APIConnectionError,
+    anthropic.RateLimitError,
+    anthropic.InternalServerError,
+    getattr(anthropic, "OverloadedError", anthropic.InternalServerError),
+)
+
+# Best-of-N: one call writes all candidates, capped to stay a non-streaming request.
+# n is clamped so every candidate gets its full per-tweet budget.
+BEST_OF_MAX_TOKENS = 16000
+CANDIDATE_MAX_TOKENS = 4000
+MAX_CANDIDATES = BEST_OF_MAX_TOKENS // CANDIDATE_MAX_TOKENS
+CANDIDATE_SEPARATOR = re.compile(r"^\s*-{3,}\s*$", re.MULTILINE)
+
+# Shared across requests (one connection pool and one in-flight limit per worker)
+_client: Optional[AsyncAnthropic] = None
+_client_key: Optional[str] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_async_client(api_key: str) -> AsyncAnthropic:
+    """Get or create the shared async Anthropic client."""
+    global _client, _client_key
+    if _client is None or _client_key != api_key:
+        # Retries are handled in ClaudeService so they can be jittered and bounded
+        _client = AsyncAnthropic(
+            api_key=api_key,
+            max_retries=0,
+            timeout=settings.CLAUDE_TIMEOUT_SECONDS,
+        )
+        _client_key = api_key
+    return _client
+
+
+def get_semaphore() -> asyncio.Semaphore:
+    """Semaphore bounding concurrent in-flight Claude calls."""
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.CLAUDE_MAX_CONCURRENCY)
+    return _semaphore
+
+
+async def close_async_client() -> None:
+    """Close the shared client's connection pool, if it was created."""
+    global _client, _client_key
+    if _client is not None:
+        await _client.close()
+        _client = None
+        _client_key = None
+
+
+def drop_truncated_tail(text: str, separator: re.Pattern) -> str:
+    """Drop the part after the last separator match from a reply cut off at max_tokens."""
+    matches = list(separator.finditer(text))
+    return text[:matches[-1].start()] if matches else text
+
+
+def completion_timeout(max_tokens: int) -> float:
+    """
+    Per-attempt timeout for a non-streaming call.
+
+    Nothing is received until the whole reply is written, so the timeout has
+    to cover generating `max_tokens`: at least CLAUDE_COMPLETE_TIMEOUT_SECONDS,
+    longer for budgets that need more at CLAUDE_MIN_TOKENS_PER_SECOND.
+    """
+    return max(
+        settings.CLAUDE_COMPLETE_TIMEOUT_SECONDS,
+        max_tokens / settings.CLAUDE_MIN_TOKENS_PER_SECOND,
+    )
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait (retry-after-ms / retry-after headers), if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms") is not None:
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after") is not None:
+            return float(headers["retry-after"])
+    except ValueError:
+        # HTTP-date form; fall back to our own backoff
+        return None
+    return None
+
+
+def retry_delay(attempt: int, error: Optional[Exception] = None) -> Optional[float]:
+    """
+    Delay before the given retry attempt (0-based).
+
+    Full-jitter exponential backoff, but never shorter than the server's
+    retry-after (sent with 429/529). Returns None when retry-after exceeds
+    CLAUDE_RETRY_AFTER_MAX_SECONDS, meaning the caller should give up.
+    """
+    cap = min(settings.CLAUDE_RETRY_MAX_DELAY, settings.CLAUDE_RETRY_BASE_DELAY * (2 ** attempt))
+    delay = random.uniform(0, cap)
+    wait = retry_after(error) if error is not None else None
+    if wait is not None:
+        if wait > settings.CLAUDE_RETRY_AFTER_MAX_SECONDS:
+            return None
+        delay = max(delay, wait)
+    return delay
 
 
 class ClaudeService:
     """Service for interacting with Claude AI API."""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[GenerationCache] = None):
         self.api_key = settings.ANTHROPIC_API_KEY or os.environ.get("ANTHROPIC_API_KEY")
         if self.api_key:
-            self.client = Anthropic(api_key=self.api_key)
+            self.client = get_async_client(self.api_key)
         else:
             self.client = None
+        self.cache = cache if cache is not None else get_generation_cache()
+
+    async def complete(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        timeout: Optional[float] = None,
+        truncated_separator: Optional[re.Pattern] = None,
+    ) -> str:
+        """
+        Send a single-prompt request to Claude and return the text reply.
+
+        With `truncated_separator`, a reply that stopped at max_tokens loses
+        everything after the separator's last match (the cut-off part).
+
+        At most CLAUDE_MAX_CONCURRENCY calls are in flight at once. Each attempt
+        is bounded by `timeout` (default: completion_timeout(max_tokens)); transient
+        failures are retried with jittered exponential backoff, without holding
+        a concurrency slot while waiting. Raises the last error when retries
+        are exhausted or the error is not retryable.
+        """
+        if not self.client:
+            raise RuntimeError("Anthropic API key is not configured")
+
+        attempt = 0
+        while True:
+            try:
+                async with get_semaphore():
+                    response = await self.client.messages.create(
+                        model=settings.CLAUDE_MODEL,
+                        max_tokens=max_tokens,
+                        messages=[{"role": "user", "content": prompt}],
+                        timeout=timeout or completion_timeout(max_tokens),
+                    )
+                text = response.content[0].text
+                if truncated_separator is not None and getattr(response, "stop_reason", None) == "max_tokens":
+                    text = drop_truncated_tail(text, truncated_separator)
+                return text
+            except RETRYABLE_ERRORS as e:
+                delay = retry_delay(attempt, e)
+                if attempt >= settings.CLAUDE_MAX_RETRIES or delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def complete_cached(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        fresh: bool = False,
+        truncated_separator: Optional[re.Pattern] = None,
+    ) -> str:
+        """
+        complete() through the generation cache.
+
+        Identical prompts for the same model are served from the cache.
+        fresh=True skips the lookup to get a new variant; the new reply
+        still replaces the cached one.
+        """
+        key = generation_cache_key(settings.CLAUDE_MODEL, str(max_tokens), prompt)
+        if not fresh:
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                return cached
+
+        content = await self.complete(prompt, max_tokens=max_tokens, truncated_separator=truncated_separator)
+        await self.cache.aset(key, content)
+        return content
+
+    async def stream_cached(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        fresh: bool = False,
+    ) -> AsyncIterator[str]:
+        """
+        stream() through the generation cache.
+
+        A cached reply is yielded as a single chunk; a stream that completes
+        is stored. fresh=True skips the lookup, as in complete_cached().
+        """
+        key = generation_cache_key(settings.CLAUDE_MODEL, str(max_tokens), prompt)
+        if not fresh:
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                yield cached
+                return
+
+        parts = []
+        async for chunk in self.stream(prompt, max_tokens=max_tokens):
+            parts.append(chunk)
+            yield chunk
+        await self.cache.aset(key, "".join(parts))
+
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a single-prompt reply from Claude as text chunks.
+
+        Holds one concurrency slot for the whole stream. `timeout` (default
+        CLAUDE_TIMEOUT_SECONDS) bounds each wait for the next chunk, not the
+        whole reply, so long generations don't time out while text is still
+        arriving. Transient failures are retried like complete(), but only
+        before the first chunk is yielded; once text has been sent the error
+        is raised to the caller.
+        """
+        if not self.client:
+            raise RuntimeError("Anthropic API key is not configured")
+
+        attempt = 0
+        while True:
+            started = False
+            try:
+                async with get_semaphore():
+                    async with self.client.messages.stream(
+                        model=settings.CLAUDE_MODEL,
+                        max_tokens=max_tokens,
+                        messages=[{"role": "user", "content": prompt}],
+                        timeout=timeout or settings.CLAUDE_TIMEOUT_SECONDS,
+                    ) as response:
+                        async for text in response.text_stream:
+                            started = True
+                            yield text
+                return
+            except RETRYABLE_ERRORS as e:
+                delay = retry_delay(attempt, e)
+                if started or attempt >= settings.CLAUDE_MAX_RETRIES or delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
 
     async def generate_tweet(
         self,
@@ -30,6 +285,7 @@ class ClaudeService:
         include_emoji: bool = True,
         custom_instructions: Optional[str] = None,
         profile: Optional[Dict[str, Any]] = None,
+        fresh: bool = False,
     ) -> str:
         """
         Generate a tweet using Claude AI.
@@ -44,6 +300,7 @@ class ClaudeService:
             include_emoji: Whether to include emojis
             custom_instructions: Additional instructions
             profile: User profile for personalization
+            fresh: Skip the generation cache and produce a new variant
 
         Returns:
             Generated tweet content
@@ -65,25 +322,207 @@ class ClaudeService:
         )
 
         try:
-            response = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=4000,
-                messages=[{"role": "user", "content": prompt}],
-            )
+            content = await self.complete_cached(prompt, max_tokens=4000, fresh=fresh)
+            return self.clean_tweet(content)
+
+        except Exception as e:
+            print(f"Claude API error: {e}")
+            return self._generate_fallback_tweet(topic, style, language)
 
-            # Extract tweet from response
-            content = response.content[0].text
+    async def stream_tweet(
+        self,
+        topic: str,
+        style: str = "casual",
+        tone: str = "engaging",
+        length: str = "medium",
+        language: str = "tr",
+        include_cta: bool = True,
+        include_emoji: bool = True,
+        custom_instructions: Optional[str] = None,
+        profile: Optional[Dict[str, Any]] = None,
+        fresh: bool = False,
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of generate_tweet.
 
-            # Clean up response (remove markdown code blocks if present)
-            if content.startswith("```"):
-                lines = content.split("\n")
-                content = "\n".join(lines[1:-1]) if len(lines) > 2 else content
+        Yields raw text chunks as they arrive; pass the joined text through
+        clean_tweet() for the final content. Without an API key, or when the
+        API fails before any text arrives, the fallback tweet is yielded as a
+        single chunk; errors after that are raised.
+        """
+        if not self.client:
+            yield self._generate_fallback_tweet(topic, style, language)
+            return
 
-            return content.strip()
+        prompt = self._build_generation_prompt(
+            topic=topic,
+            style=style,
+            tone=tone,
+            length=length,
+            language=language,
+            include_cta=include_cta,
+            include_emoji=include_emoji,
+            custom_instructions=custom_instructions,
+            profile=profile,
+        )
 
+        started = False
+        try:
+            async for chunk in self.stream_cached(prompt, max_tokens=4000, fresh=fresh):
+                started = True
+                yield chunk
         except Exception as e:
+            if started:
+                raise
             print(f"Claude API error: {e}")
-            return self._generate_fallback_tweet(topic, style, language)
+            yield self._generate_fallback_tweet(topic, style, language)
+
+    async def generate_candidates(
+        self,
+        topic: str,
+        n: int,
+        style: str = "casual",
+        tone: str = "engaging",
+        length: str = "medium",
+        language: str = "tr",
+        include_cta: bool = True,
+        include_emoji: bool = True,
+        custom_instructions: Optional[str] = None,
+        profile: Optional[Dict[str, Any]] = None,
+        fresh: bool = False,
+    ) -> List[str]:
+        """
+        Generate up to n distinct tweet candidates in a single Claude call.
+
+        The model is asked for n variants separated by "---" lines, which are
+        split, cleaned and de-duplicated here. Ranking is left to the caller.
+        n is clamped to MAX_CANDIDATES so each candidate gets CANDIDATE_MAX_TOKENS;
+        if the reply still hits max_tokens, the cut-off last candidate is dropped.
+        Arguments match generate_tweet; without an API key or on API failure
+        a single fallback tweet is returned.
+        """
+        if not self.client:
+            return [self._generate_fallback_tweet(topic, style, language)]
+
+        n = max(1, min(n, MAX_CANDIDATES))
+        prompt = self._build_generation_prompt(
+            topic=topic,
+            style=style,
+            tone=tone,
+            length=length,
+            language=language,
+            include_cta=include_cta,
+            include_emoji=include_emoji,
+            custom_instructions=custom_instructions,
+            profile=profile,
+        )
+        prompt += f"""
+Write {n} different tweets that meet the criteria above (different hook, angle and structure).
+Separate the tweets with a line containing only "---". No numbering, headings or explanations.
+"""
+
+        try:
+            content = await self.complete_cached(
+                prompt,
+                max_tokens=CANDIDATE_MAX_TOKENS * n,
+                fresh=fresh,
+                truncated_separator=CANDIDATE_SEPARATOR,
+            )
+        except Exception as e:
+            print(f"Claude API error: {e}")
+            return [self._generate_fallback_tweet(topic, style, language)]
+
+        candidates = [self.clean_tweet(part.strip()) for part in CANDIDATE_SEPARATOR.split(content)]
+        return list(dict.fromkeys(c for c in candidates if c))[:n] or [self.clean_tweet(content)]
+
+    @staticmethod
+    def clean_tweet(content: str) -> str:
+        """Clean up a generated tweet (remove markdown code blocks if present)."""
+        if content.startswith("```"):
+            lines = content.split("\n")
+            content = "\n".join(lines[1:-1]) if len(lines) > 2 else content
+
+        return content.strip()
+
+    async def generate_batch(
+        self,
+        items: List[Dict[str, Any]],
+        backend: Optional[BatchBackend] = None,
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        timeout: float = BATCH_TIMEOUT,
+        cache_results: Optional[bool] = None,
+    ) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """
+        Generate one tweet per item as a single message batch.
+
+        Each item needs a "topic" and may carry the generate_tweet options
+        (style, tone, length, language, include_cta, include_emoji,
+        custom_instructions). Polls every `poll_interval` seconds until the
+        batch ends and raises TimeoutError after `timeout`.
+
+        Returns (batch_id, results); each result is the item plus "content"
+        (None on failure) and "error". With `cache_results` (default: only
+        for the real AnthropicBatchBackend) replies are stored in the
+        generation cache under the same key generate_tweet uses, so fake
+        backends never leak their replies into interactive generation.
+        """
+        if backend is None:
+            if not self.client:
+                raise RuntimeError("Anthropic API key is not configured")
+            backend = AnthropicBatchBackend(self.client)
+        if cache_results is None:
+            cache_results = isinstance(backend, AnthropicBatchBackend)
+
+        prompts = []
+        requests = []
+        for i, item in enumerate(items):
+            prompt = self._build_generation_prompt(
+                topic=item["topic"],
+                style=item.get("style", "casual"),
+                tone=item.get("tone", "engaging"),
+                length=item.get("length", "medium"),
+                language=item.get("language", "tr"),
+                include_cta=item.get("include_cta", True),
+                include_emoji=item.get("include_emoji", True),
+                custom_instructions=item.get("custom_instructions"),
+                profile=None,
+            )
+            prompts.append(prompt)
+            # custom_id only allows [a-zA-Z0-9_-]; the item's own id is kept in the result
+            requests.append({
+                "custom_id": f"item-{i}",
+                "params": {
+                    "model": settings.CLAUDE_MODEL,
+                    "max_tokens": 4000,
+                    "messages": [{"role": "user", "content": prompt}],
+                },
+            })
+
+        if not requests:
+            return None, []
+
+        batch_id = await backend.submit(requests)
+        deadline = time.monotonic() + timeout
+        while not await backend.is_done(batch_id):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Batch {batch_id} did not finish within {timeout:.0f}s")
+            await asyncio.sleep(poll_interval)
+
+        replies = {}
+        async for custom_id, text, error in backend.results(batch_id):
+            replies[custom_id] = (text, error)
+
+        results = []
+        for i, (item, prompt) in enumerate(zip(items, prompts)):
+            text, error = replies.get(f"item-{i}", (None, "missing result"))
+            if text is not None and cache_results:
+                await self.cache.aset(generation_cache_key(settings.CLAUDE_MODEL, "4000", prompt), text)
+            results.append({
+                **item,
+                "content": self.clean_tweet(text) if text is not None else None,
+                "error": error,
+            })
+        return batch_id, results
 
     def _build_generation_prompt(
         self,
@@ -184,13 +623,9 @@ OPTIMIZED TWEET:
 """
 
         try:
-            response = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}],
-            )
+            content = await self.complete(prompt, max_tokens=2000)
 
-            return response.content[0].text.strip()
+            return content.strip()
 
         except Exception:
             return content
@@ -200,6 +635,7 @@ OPTIMIZED TWEET:
         content: str,
         style: str,
         profile: Optional[Dict[str, Any]] = None,
+        fresh: bool = False,
     ) -> str:
         """Rewrite a tweet in a different style."""
         if not self.client:
@@ -223,13 +659,9 @@ REWRITTEN TWEET:
 """
 
         try:
-            response = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}],
-            )
+            content = await self.complete_cached(prompt, max_tokens=2000, fresh=fresh)
 
-            return response.content[0].text.strip()
+            return content.strip()
 
         except Exception:
             return content
@@ -241,12 +673,58 @@ REWRITTEN TWEET:
         style: str = "educational",
         language: str = "tr",
         profile: Optional[Dict[str, Any]] = None,
+        fresh: bool = False,
     ) -> list[str]:
         """Generate a tweet thread."""
         if not self.client:
             return [f"1/5 Let's talk about {topic}..."] * tweet_count
 
-        prompt = f"""Generate a {tweet_count}-tweet thread about: {topic}
+        prompt = self._build_thread_prompt(topic, tweet_count, style, language)
+
+        try:
+            content = await self.complete_cached(prompt, max_tokens=4000, fresh=fresh)
+            return self.parse_thread(content, topic, tweet_count)
+
+        except Exception:
+            return [f"Let's talk about {topic}..."] * tweet_count
+
+    async def stream_thread(
+        self,
+        topic: str,
+        tweet_count: int = 7,
+        style: str = "educational",
+        language: str = "tr",
+        profile: Optional[Dict[str, Any]] = None,
+        fresh: bool = False,
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of generate_thread.
+
+        Yields raw text chunks; pass the joined text through parse_thread()
+        for the tweet list. API errors, including a missing API key, are raised.
+        """
+        prompt = self._build_thread_prompt(topic, tweet_count, style, language)
+        async for chunk in self.stream_cached(prompt, max_tokens=4000, fresh=fresh):
+            yield chunk
+
+    @staticmethod
+    def parse_thread(content: str, topic: str, tweet_count: int) -> list[str]:
+        """Parse a numbered-list thread reply into individual tweets."""
+        tweets = []
+        for line in content.split("\n"):
+            line = line.strip()
+            if line and not line.startswith("#"):
+                # Remove numbering if present
+                clean = line
+                for i in range(1, tweet_count + 1):
+                    clean = clean.replace(f"{i}. ", "").replace(f"{i}/", "")
+                tweets.append(clean.strip())
+
+        return tweets[:tweet_count] or [f"Thread about {topic}"] * tweet_count
+
+    def _build_thread_prompt(self, topic: str, tweet_count: int, style: str, language: str) -> str:
+        """Build the prompt for thread generation."""
+        return f"""Generate a {tweet_count}-tweet thread about: {topic}
 
 STYLE: {style}
 LANGUAGE: {language}
@@ -260,31 +738,6 @@ Each tweet should:
 Format as a numbered list of tweets.
 """
 
-        try:
-            response = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=4000,
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            content = response.content[0].text
-
-            # Parse into individual tweets
-            tweets = []
-            for line in content.split("\n"):
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    # Remove numbering if present
-                    clean = line
-                    for i in range(1, tweet_count + 1):
-                        clean = clean.replace(f"{i}. ", "").replace(f"{i}/", "")
-                    tweets.append(clean.strip())
-
-            return tweets[:tweet_count] or [f"Thread about {topic}"] * tweet_count
-
-        except Exception:
-            return [f"Let's talk about {topic}..."] * tweet_count
-
     async def expand_to_thread(
         self,
         content: str,
@@ -310,13 +763,7 @@ THREAD:
 """
 
         try:
-            response = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=4000,
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            content = response.content[0].text
+            content = await self.complete(prompt, max_tokens=4000)
 
             # Parse into individual tweets
             tweets = []
@@ -0,0 +1,229 @@
+"""
+Content-addressed cache for Claude generations.
+
+Entries are keyed by a hash of the model name and the fully rendered prompt,
+so identical generation requests are answered without another API call. The
+storage backend is pluggable: an in-memory LRU by default, or SQLite so
+entries survive restarts. Async callers use aget()/aset(), which run SQLite
+I/O in a worker thread instead of on the event loop.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Protocol, Tuple
+
+from app.core.config import settings
+
+PURGE_INTERVAL_SECONDS = 5 * 60.0  # How often expired / excess SQLite entries are dropped
+
+
+def generation_cache_key(model: str, *parts: str) -> str:
+    """SHA-256 over the model name and the rendered prompt parts."""
+    digest = hashlib.sha256()
+    for part in (model, *parts):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class GenerationStore(Protocol):
+    """Storage backend interface for GenerationCache."""
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]: ...
+    def set(self, key: str, text: str, created_at: float) -> None: ...
+    def delete(self, key: str) -> None: ...
+    def clear(self) -> None: ...
+    def __len__(self) -> int: ...
+
+
+class MemoryGenerationStore:
+    """Thread-safe in-memory LRU store."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return (text, created_at), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, text: str, created_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (text, created_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteGenerationStore:
+    """
+    Thread-safe SQLite store; entries survive restarts.
+
+    Writes don't evict. purge() drops expired entries and trims the table to
+    `max_entries`, oldest first; between purges it may briefly grow past it.
+    """
+
+    blocking = True  # Do I/O off the event loop
+
+    def __init__(self, db_path: str, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS generation_cache ("
+            "key TEXT PRIMARY KEY, text TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_generation_cache_created_at ON generation_cache(created_at)"
+        )
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return (text, created_at), or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text, created_at FROM generation_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, key: str, text: str, created_at: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO generation_cache (key, text, created_at) VALUES (?, ?, ?)",
+                (key, text, created_at),
+            )
+            self._db.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM generation_cache WHERE key = ?", (key,))
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM generation_cache")
+            self._db.commit()
+
+    def purge(self, older_than: float) -> None:
+        """Delete entries created before `older_than`, then all but the newest `max_entries`."""
+        with self._lock:
+            self._db.execute("DELETE FROM generation_cache WHERE created_at < ?", (older_than,))
+            self._db.execute(
+                "DELETE FROM generation_cache WHERE key IN ("
+                "SELECT key FROM generation_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM generation_cache").fetchone()[0]
+
+
+class GenerationCache:
+    """TTL cache of Claude replies over a pluggable store, with hit/miss counters."""
+
+    def __init__(self, store: GenerationStore, ttl: float, purge_interval: float = PURGE_INTERVAL_SECONDS):
+        self.store = store
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._next_purge = 0.0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a fresh cached reply, or None."""
+        entry = self.store.get(key)
+        if entry is not None and time.time() - entry[1] >= self.ttl:
+            self.store.delete(key)
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry[0] if entry is not None else None
+
+    def set(self, key: str, text: str) -> None:
+        """Store a reply; stores with purge() are purged at most every purge_interval."""
+        now = time.time()
+        self.store.set(key, text, now)
+        purge = getattr(self.store, "purge", None)
+        if purge is None:
+            return
+        with self._lock:
+            due = now >= self._next_purge
+            if due:
+                self._next_purge = now + self.purge_interval
+        if due:
+            purge(now - self.ttl)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """get() for async callers; blocking stores run in a worker thread."""
+        if getattr(self.store, "blocking", False):
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def aset(self, key: str, text: str) -> None:
+        """set() for async callers; blocking stores run in a worker thread."""
+        if getattr(self.store, "blocking", False):
+            await asyncio.to_thread(self.set, key, text)
+        else:
+            self.set(key, text)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self.store.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters, hit rate and current entry count."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "entries": len(self.store),
+        }
+
+
+# Singleton instance
+_generation_cache: Optional[GenerationCache] = None
+
+
+def get_generation_cache() -> GenerationCache:
+    """Get or create the shared generation cache."""
+    global _generation_cache
+    if _generation_cache is None:
+        if settings.GENERATION_CACHE_DB_PATH:
+            store = SQLiteGenerationStore(
+                settings.GENERATION_CACHE_DB_PATH, settings.GENERATION_CACHE_MAX_ENTRIES
+            )
+        else:
+            store = MemoryGenerationStore(settings.GENERATION_CACHE_MAX_ENTRIES)
+        _generation_cache = GenerationCache(store, ttl=settings.GENERATION_CACHE_TTL_SECONDS)
+    return _generation_cache
@@ -0,0 +1,239 @@
+"""
+Shared pooled HTTP client for scraper I/O.
+
+Keeps TCP+TLS connections alive between fetches instead of opening a fresh
+connection per request. Response bodies are decoded transparently (gzip and
+deflate always, brotli when the ``brotli`` package is installed).
+"""
+
+import asyncio
+import threading
+from typing import AsyncIterator, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+# Pool limits
+MAX_CONNECTIONS = 20
+MAX_CONNECTIONS_PER_HOST = 4
+KEEPALIVE_EXPIRY = 30.0  # seconds
+
+
+class PooledHTTPClient:
+    """
+    Thread-safe wrapper around a single ``httpx.Client`` connection pool.
+
+    httpx only limits connections globally, so a bounded semaphore per host
+    caps how many requests may hit the same host at once.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = MAX_CONNECTIONS,
+        max_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+    ):
+        self.max_per_host = max_per_host
+        self._client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            verify=False,
+            follow_redirects=True,
+        )
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Get the concurrency slot for a URL's host."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+        return slot
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 15,
+    ) -> Tuple[int, str]:
+        """
+        GET a URL through the pool.
+
+        Returns (status_code, decoded body). Raises on 4xx/5xx responses.
+        """
+        with self._host_slot(url):
+            response = self._client.get(url, headers=headers, timeout=timeout)
+            response.raise_for_status()
+            return response.status_code, response.content.decode("utf-8", errors="ignore")
+
+    def get_text(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 15,
+    ) -> str:
+        """GET a URL and return the decoded body."""
+        return self.get(url, headers=headers, timeout=timeout)[1]
+
+    def iter_text(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 15,
+    ) -> Iterator[str]:
+        """
+        Stream a GET response as decoded text chunks.
+
+        The body is never buffered whole. Closing the generator early closes
+        the response without reading the rest. Raises on 4xx/5xx responses.
+        """
+        with self._host_slot(url):
+            with self._client.stream("GET", url, headers=headers, timeout=timeout) as response:
+                response.raise_for_status()
+                yield from response.iter_text()
+
+    def is_up(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 5,
+    ) -> bool:
+        """Check whether a URL answers with HTTP 200."""
+        try:
+            return self.get(url, headers=headers, timeout=timeout)[0] == 200
+        except Exception:
+            return False
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._client.close()
+
+
+class AsyncPooledHTTPClient:
+    """
+    Async counterpart of PooledHTTPClient around one ``httpx.AsyncClient``.
+
+    Must be created and used from the same event loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = MAX_CONNECTIONS,
+        max_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+    ):
+        self.max_per_host = max_per_host
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            verify=False,
+            follow_redirects=True,
+        )
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        """Get the concurrency slot for a URL's host."""
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        return slot
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 15,
+    ) -> Tuple[int, str]:
+        """
+        GET a URL through the pool.
+
+        Returns (status_code, decoded body). Raises on 4xx/5xx responses.
+        """
+        async with self._host_slot(url):
+            response = await self._client.get(url, headers=headers, timeout=timeout)
+            response.raise_for_status()
+            return response.status_code, response.content.decode("utf-8", errors="ignore")
+
+    async def get_text(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 15,
+    ) -> str:
+        """GET a URL and return the decoded body."""
+        return (await self.get(url, headers=headers, timeout=timeout))[1]
+
+    async def aiter_text(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 15,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a GET response as decoded text chunks.
+
+        Use with contextlib.aclosing so an early exit closes the response.
+        Raises on 4xx/5xx responses.
+        """
+        async with self._host_slot(url):
+            async with self._client.stream("GET", url, headers=headers, timeout=timeout) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_text():
+                    yield chunk
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self._client.aclose()
+
+
+# Singleton instance
+_http_client: Optional[PooledHTTPClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> PooledHTTPClient:
+    """Get or create the shared HTTP client."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = PooledHTTPClient()
+    return _http_client
+
+
+def close_http_client() -> None:
+    """Close the shared HTTP client, if it was created."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
+# Async singleton instance
+_async_http_client: Optional[AsyncPooledHTTPClient] = None
+
+
+def get_async_http_client() -> AsyncPooledHTTPClient:
+    """Get or create the shared async HTTP client (call from the app's event loop)."""
+    global _async_http_client
+    if _async_http_client is None:
+        _async_http_client = AsyncPooledHTTPClient()
+    return _async_http_client
+
+
+async def close_async_http_client() -> None:
+    """Close the shared async HTTP client, if it was created."""
+    global _async_http_client
+    if _async_http_client is not None:
+        await _async_http_client.aclose()
+        _async_http_client = None
@@ -0,0 +1,167 @@
+"""
+Health registry and circuit breakers for scraper mirrors.
+
+Tracks latency, success rate and the last failure per host. After a failure
+the host's breaker opens for an exponentially growing backoff, during which
+requests to it are skipped. Once the backoff expires the next request or
+probe tries it again (half-open), and a success closes the breaker.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import httpx
+
+# Circuit breaker / health settings
+BACKOFF_BASE_SECONDS = 30.0
+BACKOFF_MAX_SECONDS = 30 * 60.0
+LATENCY_EWMA_ALPHA = 0.3
+FRESH_SECONDS = 120.0  # Measurements newer than this are reused instead of re-probing
+
+
+def is_host_failure(error: BaseException) -> bool:
+    """
+    Whether an error says the host itself is unhealthy.
+
+    Only transport errors, timeouts, 429 and 5xx responses count. Other 4xx
+    responses (e.g. an unknown username) and parse errors fail the request
+    without opening the host's breaker.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, (httpx.TransportError, OSError))
+
+
+@dataclass
+class InstanceHealth:
+    """Health record for one host."""
+    host: str
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    avg_latency: Optional[float] = None  # seconds, EWMA
+    last_checked: Optional[float] = None
+    last_failure: Optional[float] = None
+    last_error: Optional[str] = None
+    open_until: float = 0.0
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        total = self.successes + self.failures
+        return self.successes / total if total else None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the circuit breaker currently blocks requests."""
+        return time.time() < self.open_until
+
+    @property
+    def state(self) -> str:
+        if self.is_open:
+            return "open"
+        return "half_open" if self.consecutive_failures else "closed"
+
+    def to_dict(self) -> Dict:
+        return {
+            "host": self.host,
+            "state": self.state,
+            "success_rate": round(self.success_rate, 2) if self.success_rate is not None else None,
+            "avg_latency_ms": int(self.avg_latency * 1000) if self.avg_latency is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "last_failure": self.last_failure,
+            "last_error": self.last_error,
+            "retry_in": max(0, int(self.open_until - time.time())),
+        }
+
+
+class InstanceHealthRegistry:
+    """Thread-safe per-host health records with exponential-backoff breakers."""
+
+    def __init__(
+        self,
+        backoff_base: float = BACKOFF_BASE_SECONDS,
+        backoff_max: float = BACKOFF_MAX_SECONDS,
+    ):
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._health: Dict[str, InstanceHealth] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> InstanceHealth:
+        with self._lock:
+            health = self._health.get(host)
+            if health is None:
+                health = self._health[host] = InstanceHealth(host=host)
+            return health
+
+    def record_success(self, host: str, latency: float) -> None:
+        health = self.get(host)
+        with self._lock:
+            health.successes += 1
+            health.consecutive_failures = 0
+            health.open_until = 0.0
+            health.last_checked = time.time()
+            if health.avg_latency is None:
+                health.avg_latency = latency
+            else:
+                health.avg_latency += LATENCY_EWMA_ALPHA * (latency - health.avg_latency)
+
+    def record_failure(self, host: str, error: str) -> None:
+        health = self.get(host)
+        now = time.time()
+        with self._lock:
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.last_checked = now
+            health.last_failure = now
+            health.last_error = error[:200]
+            backoff = min(self.backoff_base * 2 ** (health.consecutive_failures - 1), self.backoff_max)
+            health.open_until = now + backoff
+
+    def is_available(self, host: str) -> bool:
+        """True unless the host's breaker is open."""
+        return not self.get(host).is_open
+
+    def is_fresh(self, host: str, max_age: float = FRESH_SECONDS) -> bool:
+        checked = self.get(host).last_checked
+        return checked is not None and time.time() - checked < max_age
+
+    def ordered(self, hosts: List[str]) -> List[str]:
+        """
+        Sort hosts by measured health and drop those with an open breaker.
+
+        Higher success rate first, then lower latency; unmeasured hosts keep
+        their given order behind hosts that are known to work.
+        """
+        def key(item):
+            index, host = item
+            health = self.get(host)
+            rate = health.success_rate
+            return (
+                -(rate if rate is not None else 0.5),
+                health.avg_latency if health.avg_latency is not None else float("inf"),
+                index,
+            )
+
+        available = [(i, h) for i, h in enumerate(hosts) if self.is_available(h)]
+        return [h for _, h in sorted(available, key=key)]
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            records = list(self._health.values())
+        return [r.to_dict() for r in records]
+
+
+# Singleton instance
+_registry: Optional[InstanceHealthRegistry] = None
+
+
+def get_instance_health() -> InstanceHealthRegistry:
+    """Get or create the shared health registry."""
+    global _registry
+    if _registry is None:
+        _registry = InstanceHealthRegistry()
+    return _registry
@@ -0,0 +1,102 @@
+"""
+Short-lived TTL + LRU cache of the profile fields used for personalization.
+
+Generation and analysis routes only need a few profile columns, and a user
+typically hits several of them in a row. Entries expire after a short TTL and
+are dropped explicitly when the user updates their profile.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from supabase import AsyncClient
+
+from app.core.config import settings
+
+# Columns read by TweetAnalyzer and the Claude prompt builders
+PROFILE_COLUMNS = "id,followers,verified,x_username"
+
+
+class ProfileCache:
+    """Thread-safe TTL + LRU cache of profiles keyed by user ID (None = no profile)."""
+
+    _MISSING = object()
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Optional[Dict[str, Any]], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, default: Any = _MISSING) -> Any:
+        """Return a fresh cached profile (possibly None), or `default` on a miss."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return default
+            profile, stored_at = entry
+            if time.time() - stored_at >= self.ttl:
+                del self._entries[user_id]
+                return default
+            self._entries.move_to_end(user_id)
+        return dict(profile) if profile is not None else None
+
+    def set(self, user_id: str, profile: Optional[Dict[str, Any]]) -> None:
+        """Cache a loaded profile, or None when the user has none yet."""
+        with self._lock:
+            self._entries[user_id] = (dict(profile) if profile is not None else None, time.time())
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop one user's entry, or every entry when user_id is None."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def load(self, supabase: AsyncClient, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a user's profile, querying Supabase only on a cache miss.
+
+        Query failures return None and are not cached.
+        """
+        profile = self.get(user_id)
+        if profile is not self._MISSING:
+            return profile
+
+        try:
+            result = await supabase.table("profiles") \
+                .select(PROFILE_COLUMNS) \
+                .eq("id", user_id) \
+                .maybe_single() \
+                .execute()
+        except Exception as e:
+            print(f"Failed to load profile: {e}")
+            return None
+
+        profile = result.data if result is not None else None
+        self.set(user_id, profile)
+        return profile
+
+
+# Singleton instance
+_profile_cache: Optional[ProfileCache] = None
+
+
+def get_profile_cache() -> ProfileCache:
+    """Get or create the shared profile cache."""
+    global _profile_cache
+    if _profile_cache is None:
+        _profile_cache = ProfileCache(
+            ttl=settings.PROFILE_CACHE_TTL_SECONDS,
+            max_entries=settings.PROFILE_CACHE_MAX_ENTRIES,
+        )
+    return _profile_cache
@@ -3,7 +3,7 @@ Thread Generator service.
 Creates multi-tweet threads from a topic or expands a long tweet.
 """
 
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from app.services.claude import ClaudeService
 
 
@@ -20,6 +20,7 @@ class ThreadGenerator:
         style: str = "educational",
         language: str = "tr",
         profile: Optional[Dict] = None,
+        fresh: bool = False,
     ) -> List[str]:
         """
         Generate a tweet thread about a topic.
@@ -30,6 +31,7 @@ class ThreadGenerator:
             style: Thread style (educational, storytelling, provocative)
             language: Language code
             profile: User profile for personalization
+            fresh: Skip the generation cache and produce a new variant
 
         Returns:
             List of tweet texts
@@ -56,31 +58,70 @@ Format as a numbered list, one tweet per line.
                 style=style,
                 language=language,
                 profile=profile,
+                fresh=fresh,
             )
 
-            # Add numbering if not present
-            numbered_tweets = []
-            for i, tweet in enumerate(tweets[:tweet_count], 1):
-                if not any(f"{i}/{tweet_count}" in tweet for x in range(1, tweet_count + 1)):
-                    # Add numbering
-                    numbered_tweets.append(f"{i}/{tweet_count} {tweet}")
-                else:
-                    numbered_tweets.append(tweet)
-
-            return numbered_tweets
+            return self._number_tweets(tweets, tweet_count)
 
         except Exception as e:
             print(f"Thread generation failed: {e}")
-            # Fallback
-            return [
-                f"1/{tweet_count} Let's talk about {topic} 🧵",
-                f"2/{tweet_count} Here's what most people don't know...",
-                f"3/{tweet_count} The reality is actually quite different.",
-                f"4/{tweet_count} Let me explain why this matters...",
-                f"5/{tweet_count} Based on my experience...",
-                f"6/{tweet_count} Here's what you should do instead:",
-                f"7/{tweet_count} Follow for more insights! ✨",
-            ][:tweet_count]
+            return self.fallback_thread(topic, tweet_count)
+
+    async def stream_thread(
+        self,
+        topic: str,
+        tweet_count: int = 7,
+        style: str = "educational",
+        language: str = "tr",
+        profile: Optional[Dict] = None,
+        fresh: bool = False,
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of generate_thread.
+
+        Yields raw text chunks as they arrive. Pass the joined text to
+        finish_thread() for the numbered tweets; if the stream fails before
+        any text arrives, use fallback_thread() instead.
+        """
+        async for chunk in self.claude.stream_thread(
+            topic=topic,
+            tweet_count=tweet_count,
+            style=style,
+            language=language,
+            profile=profile,
+            fresh=fresh,
+        ):
+            yield chunk
+
+    def finish_thread(self, content: str, topic: str, tweet_count: int) -> List[str]:
+        """Turn a streamed thread reply into numbered tweets, like generate_thread."""
+        return self._number_tweets(ClaudeService.parse_thread(content, topic, tweet_count), tweet_count)
+
+    @staticmethod
+    def _number_tweets(tweets: List[str], tweet_count: int) -> List[str]:
+        """Add x/N numbering to tweets that don't have it."""
+        numbered_tweets = []
+        for i, tweet in enumerate(tweets[:tweet_count], 1):
+            if not any(f"{i}/{tweet_count}" in tweet for x in range(1, tweet_count + 1)):
+                # Add numbering
+                numbered_tweets.append(f"{i}/{tweet_count} {tweet}")
+            else:
+                numbered_tweets.append(tweet)
+
+        return numbered_tweets
+
+    @staticmethod
+    def fallback_thread(topic: str, tweet_count: int) -> List[str]:
+        """Generic thread used when AI generation fails."""
+        return [
+            f"1/{tweet_count} Let's talk about {topic} 🧵",
+            f"2/{tweet_count} Here's what most people don't know...",
+            f"3/{tweet_count} The reality is actually quite different.",
+            f"4/{tweet_count} Let me explain why this matters...",
+            f"5/{tweet_count} Based on my experience...",
+            f"6/{tweet_count} Here's what you should do instead:",
+            f"7/{tweet_count} Follow for more insights! ✨",
+        ][:tweet_count]
 
     async def expand_to_thread(
         self,
@@ -0,0 +1,179 @@
+"""
+TTL + LRU cache for scraped timelines, keyed by username.
+
+Entries live in memory (bounded, least recently used evicted first) and can
+optionally be mirrored to a SQLite file so fresh timelines survive restarts.
+Async callers use aget()/aset(), which run SQLite I/O in a worker thread
+instead of on the event loop.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+
+@dataclass
+class CachedTimeline:
+    """A cached timeline and where it came from."""
+    username: str
+    tweets: List[Dict]
+    method: Optional[str]  # Scraping method that produced the entry
+    count: int  # Number of tweets requested when it was fetched
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        """Seconds since the timeline was fetched."""
+        return time.time() - self.fetched_at
+
+
+class TimelineCache:
+    """Thread-safe TTL + LRU timeline cache with an optional SQLite store."""
+
+    def __init__(self, ttl: float, max_entries: int, db_path: Optional[str] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedTimeline]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS timeline_cache ("
+                "username TEXT PRIMARY KEY, tweets TEXT NOT NULL, method TEXT, "
+                "count INTEGER NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def _key(username: str) -> str:
+        return username.lstrip("@").strip().lower()
+
+    def get(self, username: str, count: int = 50) -> Optional[CachedTimeline]:
+        """
+        Return a fresh entry covering at least `count` tweets, or None.
+        """
+        key = self._key(username)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                entry = self._load(key)
+                if entry is not None:
+                    self._store(entry)
+            if entry is None:
+                return None
+            if entry.age >= self.ttl:
+                self._entries.pop(key, None)
+                return None
+            if entry.count < count:
+                return None
+            self._entries.move_to_end(key)
+
+        return CachedTimeline(
+            username=entry.username,
+            tweets=[dict(t) for t in entry.tweets[:count]],
+            method=entry.method,
+            count=count,
+            fetched_at=entry.fetched_at,
+        )
+
+    def set(self, username: str, count: int, tweets: List[Dict], method: Optional[str]) -> CachedTimeline:
+        """Store a freshly scraped timeline."""
+        entry = CachedTimeline(
+            username=self._key(username),
+            tweets=[dict(t) for t in tweets],
+            method=method,
+            count=count,
+            fetched_at=time.time(),
+        )
+        with self._lock:
+            self._store(entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO timeline_cache (username, tweets, method, count, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (entry.username, json.dumps(entry.tweets), entry.method, entry.count, entry.fetched_at),
+                )
+                self._db.execute(
+                    "DELETE FROM timeline_cache WHERE fetched_at < ?",
+                    (entry.fetched_at - self.ttl,),
+                )
+                self._db.commit()
+        return entry
+
+    async def aget(self, username: str, count: int = 50) -> Optional[CachedTimeline]:
+        """get() for async callers; with a SQLite store it runs in a worker thread."""
+        if self._db is not None:
+            return await asyncio.to_thread(self.get, username, count)
+        return self.get(username, count)
+
+    async def aset(self, username: str, count: int, tweets: List[Dict], method: Optional[str]) -> CachedTimeline:
+        """set() for async callers; with a SQLite store it runs in a worker thread."""
+        if self._db is not None:
+            return await asyncio.to_thread(self.set, username, count, tweets, method)
+        return self.set(username, count, tweets, method)
+
+    def invalidate(self, username: Optional[str] = None) -> None:
+        """Drop one user's entry, or every entry when username is None."""
+        with self._lock:
+            if username is None:
+                self._entries.clear()
+                if self._db is not None:
+                    self._db.execute("DELETE FROM timeline_cache")
+            else:
+                key = self._key(username)
+                self._entries.pop(key, None)
+                if self._db is not None:
+                    self._db.execute("DELETE FROM timeline_cache WHERE username = ?", (key,))
+            if self._db is not None:
+                self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, entry: CachedTimeline) -> None:
+        """Insert into memory and evict the LRU entry if over capacity. Caller holds the lock."""
+        self._entries[entry.username] = entry
+        self._entries.move_to_end(entry.username)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[CachedTimeline]:
+        """Read an entry from SQLite. Caller holds the lock."""
+        row = self._db.execute(
+            "SELECT tweets, method, count, fetched_at FROM timeline_cache WHERE username = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        tweets, method, count, fetched_at = row
+        return CachedTimeline(
+            username=key,
+            tweets=json.loads(tweets),
+            method=method,
+            count=count,
+            fetched_at=fetched_at,
+        )
+
+
+# Singleton instance
+_timeline_cache: Optional[TimelineCache] = None
+
+
+def get_timeline_cache() -> TimelineCache:
+    """Get or create the shared timeline cache."""
+    global _timeline_cache
+    if _timeline_cache is None:
+        _timeline_cache = TimelineCache(
+            ttl=settings.TIMELINE_CACHE_TTL_SECONDS,
+            max_entries=settings.TIMELINE_CACHE_MAX_ENTRIES,
+            db_path=settings.TIMELINE_CACHE_DB_PATH or None,
+        )
+    return _timeline_cache
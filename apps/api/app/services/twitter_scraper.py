@@ -5,17 +5,15 @@ No API key required - uses public frontends and syndication API.
 
 import re
 import json
-import gzip
-import io
-import urllib.request
-import ssl
+import time
 from typing import List, Dict, Optional
 from dataclasses import dataclass
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
 
-# SSL context for HTTPS requests
-SSL_CONTEXT = ssl.create_default_context()
-SSL_CONTEXT.check_hostname = False
-SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+from app.services.http_client import PooledHTTPClient, get_http_client
+from app.services.timeline_cache import TimelineCache, get_timeline_cache
+from app.services.instance_health import InstanceHealthRegistry, get_instance_health, is_host_failure
 
 
 @dataclass
@@ -30,6 +28,231 @@ class ScrapedTweet:
     tweet_id: Optional[str] = None
 
 
+# Accept-Encoding is left to httpx (gzip/deflate, plus br when brotli is installed)
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Connection': 'keep-alive',
+}
+
+SYNDICATION_URL = "https://syndication.twitter.com/srv/timeline-profile/screen-name/{username}"
+SYNDICATION_HEADERS = {
+    'Referer': 'https://twitter.com/',
+    'Origin': 'https://twitter.com',
+}
+
+
+def _tweets_from_next_data(data: Dict, count: int) -> List[ScrapedTweet]:
+    """Extract tweets from the syndication page's __NEXT_DATA__ JSON."""
+    tweets = []
+    timeline = data.get('props', {}).get('pageProps', {}).get('timeline', {})
+    entries = timeline.get('entries', [])
+
+    for entry in entries:
+        if entry.get('content', {}).get('entryType') == 'TimelineTweet':
+            tweet_data = entry['content']['itemContent']['tweet_results']['result']
+            legacy = tweet_data.get('legacy', {})
+
+            text = legacy.get('fullText', '')
+            if not text:
+                continue
+
+            metrics = legacy.get('core', {}).get('user_result', {}).get('result', {}).get('legacy', {})
+            favorites = metrics.get('favorite_count', 0) or legacy.get('favorite_count', 0)
+
+            scraped = ScrapedTweet(
+                text=text,
+                likes=int(favorites),
+                retweets=int(legacy.get('retweet_count', 0)),
+                replies=int(legacy.get('reply_count', 0)),
+                views=int(legacy.get('views', {}).get('count', 0)),
+                created_at=legacy.get('created_at'),
+                tweet_id=legacy.get('id_str'),
+            )
+            tweets.append(scraped)
+
+            if len(tweets) >= count:
+                break
+
+    return tweets
+
+
+class TimelineParser(HTMLParser):
+    """
+    Base class for incremental timeline parsers.
+
+    Feed the page chunk by chunk as it arrives; parsed tweets accumulate in
+    `tweets` and `finished` turns True once `count` tweets are collected, at
+    which point the caller should stop reading the response.
+    """
+
+    def __init__(self, count: int):
+        super().__init__(convert_charrefs=True)
+        self.count = count
+        self.tweets: List[ScrapedTweet] = []
+
+    @property
+    def finished(self) -> bool:
+        return len(self.tweets) >= self.count
+
+    def add(self, tweet: ScrapedTweet) -> None:
+        if not self.finished:
+            self.tweets.append(tweet)
+
+
+class SyndicationTimelineParser(TimelineParser):
+    """Collects the __NEXT_DATA__ script and parses it as soon as it closes."""
+
+    def __init__(self, count: int):
+        super().__init__(count)
+        self.found = False
+        self._script: Optional[List[str]] = None
+
+    @property
+    def finished(self) -> bool:
+        # Everything needed is in the JSON blob; the rest of the page is irrelevant
+        return self.found
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "script" and not self.found and dict(attrs).get("id") == "__NEXT_DATA__":
+            self._script = []
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._script is not None:
+            data = json.loads("".join(self._script))
+            self._script = None
+            self.found = True
+            self.tweets = _tweets_from_next_data(data, self.count)
+
+    def handle_data(self, data):
+        if self._script is not None:
+            self._script.append(data)
+
+
+class XCancelTimelineParser(TimelineParser):
+    """Extracts the text of each <div data-testid="tweetText"> block."""
+
+    def __init__(self, count: int):
+        super().__init__(count)
+        self._text: Optional[List[str]] = None
+        self._depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "div":
+            return
+        if self._text is not None:
+            self._depth += 1
+        elif dict(attrs).get("data-testid") == "tweetText":
+            self._text = []
+            self._depth = 1
+
+    def handle_endtag(self, tag):
+        if tag != "div" or self._text is None:
+            return
+        self._depth -= 1
+        if self._depth == 0:
+            text = "".join(self._text).strip()
+            self._text = None
+            if text:
+                self.add(ScrapedTweet(text=text))
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+
+class NitterTimelineParser(TimelineParser):
+    """Extracts tweet text and like counts from Nitter timeline items."""
+
+    LIKES_PATTERN = re.compile(r'(\d[\d,]*)\s*Likes')
+
+    def __init__(self, count: int):
+        super().__init__(count)
+        self._item_depth = 0  # div nesting depth inside the current timeline-item
+        self._item_text: List[str] = []
+        self._content: Optional[List[str]] = None
+        self._content_depth = 0
+        self._text: Optional[str] = None
+        self._likes: Optional[int] = None
+        self._in_heart = False
+
+    def handle_starttag(self, tag, attrs):
+        css_class = dict(attrs).get("class") or ""
+        if tag == "div":
+            if self._item_depth:
+                self._item_depth += 1
+                if self._content is None and self._text is None and css_class.startswith("tweet-content"):
+                    self._content = []
+                    self._content_depth = self._item_depth
+            elif css_class.startswith("timeline-item"):
+                self._item_depth = 1
+                self._item_text = []
+                self._text = None
+                self._likes = None
+        elif tag == "span" and self._item_depth and "icon-heart" in css_class:
+            self._in_heart = True
+
+    def handle_endtag(self, tag):
+        if tag != "div" or not self._item_depth:
+            return
+        if self._content is not None and self._item_depth == self._content_depth:
+            self._text = "".join(self._content).strip()
+            self._content = None
+        self._item_depth -= 1
+        if self._item_depth == 0:
+            self._finish_item()
+
+    def handle_data(self, data):
+        if not self._item_depth:
+            return
+        self._item_text.append(data)
+        if self._content is not None:
+            self._content.append(data)
+        elif self._in_heart and data.strip():
+            digits = data.strip().replace(",", "")
+            if digits.isdigit():
+                self._likes = int(digits)
+            self._in_heart = False
+
+    def _finish_item(self):
+        if self._text:
+            likes = self._likes
+            if likes is None:
+                likes_match = self.LIKES_PATTERN.search("".join(self._item_text))
+                likes = int(likes_match.group(1).replace(",", "")) if likes_match else 0
+            self.add(ScrapedTweet(text=self._text, likes=likes))
+        self._item_text = []
+        self._text = None
+        self._in_heart = False
+
+
+def timeline_parser_for(instance: str, count: int) -> TimelineParser:
+    """Pick the incremental parser matching an instance's markup."""
+    if is_xcancel_like(instance):
+        return XCancelTimelineParser(count)
+    return NitterTimelineParser(count)
+
+
+def is_xcancel_like(instance: str) -> bool:
+    """Whether an instance serves xcancel-style markup rather than Nitter's."""
+    return "xcancel" in instance or "twiiit" in instance
+
+
+def to_tweet_dicts(tweets: List[ScrapedTweet]) -> List[Dict]:
+    """Convert scraped tweets to the dictionaries returned by fetch_tweets."""
+    return [
+        {
+            "text": t.text,
+            "likes": t.likes,
+            "retweets": t.retweets or 0,
+            "replies": t.replies or 0,
+            "impressions": t.views or 100,
+        }
+        for t in tweets
+    ]
+
+
 class TwitterScraper:
     """
     Free Twitter/X scraper - No API key required.
@@ -48,28 +271,72 @@ class TwitterScraper:
         "nitter.poast.org",
     ]
 
-    def __init__(self):
+    SYNDICATION_HOST = "syndication.twitter.com"
+
+    def __init__(
+        self,
+        http_client: Optional[PooledHTTPClient] = None,
+        cache: Optional[TimelineCache] = None,
+        health: Optional[InstanceHealthRegistry] = None,
+    ):
         self.working_instance = None
         self.working_method = None
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        }
+        self.last_from_cache = False
+        self.http = http_client or get_http_client()
+        self.cache = cache if cache is not None else get_timeline_cache()
+        self.health = health or get_instance_health()
+        self.headers = dict(DEFAULT_HEADERS)
+
+    def _tracked_parse(
+        self,
+        url: str,
+        parser: TimelineParser,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 15,
+    ) -> TimelineParser:
+        """
+        Stream a page into an incremental parser, recording host health.
 
-    def _decompress_response(self, response) -> str:
-        """Decompress gzip response."""
-        data = response.read()
-        if response.info().get('Content-Encoding') == 'gzip':
-            try:
-                buf = io.BytesIO(data)
-                with gzip.GzipFile(fileobj=buf) as f:
-                    return f.read().decode('utf-8')
-            except:
-                pass
-        return data.decode('utf-8', errors='ignore')
+        Stops reading as soon as the parser has what it needs.
+        """
+        host = urlsplit(url).netloc
+        if not self.health.is_available(host):
+            raise ConnectionError(f"{host} circuit open")
+        start = time.monotonic()
+        chunks = self.http.iter_text(url, headers=headers or self.headers, timeout=timeout)
+        try:
+            for chunk in chunks:
+                parser.feed(chunk)
+                if parser.finished:
+                    break
+            else:
+                parser.close()
+        except Exception as e:
+            if is_host_failure(e):
+                self.health.record_failure(host, str(e))
+            else:
+                # The host answered; only this request failed
+                self.health.record_success(host, time.monotonic() - start)
+            raise
+        finally:
+            chunks.close()
+        self.health.record_success(host, time.monotonic() - start)
+        return parser
+
+    def probe_instance(self, host: str, timeout: float = 8) -> bool:
+        """Probe a host's front page and record the result."""
+        try:
+            # A zero-count parser is finished after the first chunk
+            self._tracked_parse(f"https://{host}/", TimelineParser(0), timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def probe_all(self) -> None:
+        """Probe every known host whose breaker is not open."""
+        for host in [self.SYNDICATION_HOST] + self.ALTERNATIVE_INSTANCES:
+            if self.health.is_available(host):
+                self.probe_instance(host)
 
     def fetch_tweets_syndication(self, username: str, count: int = 50) -> List[ScrapedTweet]:
         """
@@ -77,93 +344,34 @@ class TwitterScraper:
 
         This is an open endpoint that doesn't require authentication.
         """
-        tweets = []
         try:
-            url = f"https://syndication.twitter.com/srv/timeline-profile/screen-name/{username}"
-
-            headers = {
-                **self.headers,
-                'Referer': 'https://twitter.com/',
-                'Origin': 'https://twitter.com',
-            }
-
-            req = urllib.request.Request(url, headers=headers)
-            with urllib.request.urlopen(req, timeout=15, context=SSL_CONTEXT) as response:
-                html = self._decompress_response(response)
-
-            if not html:
-                return []
-
-            # Extract JSON from HTML
-            json_pattern = r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>'
-            json_match = re.search(json_pattern, html, re.DOTALL)
-
-            if json_match:
-                data = json.loads(json_match.group(1))
-                timeline = data.get('props', {}).get('pageProps', {}).get('timeline', {})
-                entries = timeline.get('entries', [])
-
-                for entry in entries:
-                    if entry.get('content', {}).get('entryType') == 'TimelineTweet':
-                        tweet_data = entry['content']['itemContent']['tweet_results']['result']
-                        legacy = tweet_data.get('legacy', {})
-
-                        text = legacy.get('fullText', '')
-                        if not text:
-                            continue
-
-                        metrics = legacy.get('core', {}).get('user_result', {}).get('result', {}).get('legacy', {})
-                        favorites = metrics.get('favorite_count', 0) or legacy.get('favorite_count', 0)
-
-                        scraped = ScrapedTweet(
-                            text=text,
-                            likes=int(favorites),
-                            retweets=int(legacy.get('retweet_count', 0)),
-                            replies=int(legacy.get('reply_count', 0)),
-                            views=int(legacy.get('views', {}).get('count', 0)),
-                            created_at=legacy.get('created_at'),
-                            tweet_id=legacy.get('id_str'),
-                        )
-                        tweets.append(scraped)
-
-                        if len(tweets) >= count:
-                            break
+            url = SYNDICATION_URL.format(username=username)
+            headers = {**self.headers, **SYNDICATION_HEADERS}
 
+            parser = self._tracked_parse(url, SyndicationTimelineParser(count), headers=headers, timeout=15)
+            if parser.found:
                 self.working_method = "syndication"
-                return tweets
+                return parser.tweets
 
         except Exception as e:
             print(f"[Syndication] Failed: {e}")
 
         return []
 
-    def fetch_tweets_xcancel(self, username: str, count: int = 50) -> List[ScrapedTweet]:
+    def fetch_tweets_xcancel(
+        self,
+        username: str,
+        count: int = 50,
+        instance: str = "xcancel.com",
+    ) -> List[ScrapedTweet]:
         """
         Fetch tweets using xcancel.com (public Twitter frontend).
         """
         tweets = []
         try:
-            url = f"https://{self.working_instance}/{username}"
-
-            req = urllib.request.Request(url, headers=self.headers)
-            with urllib.request.urlopen(req, timeout=15, context=SSL_CONTEXT) as response:
-                html = self._decompress_response(response)
-
-            # Parse tweets from HTML
-            # xcancel uses a specific structure for tweet content
-            tweet_pattern = r'<div[^>]*data-testid="tweet"[^>]*>(.*?)</div>'
-            tweets_html = re.findall(tweet_pattern, html, re.DOTALL)
-
-            for tweet_html in tweets_html[:count]:
-                # Extract tweet text
-                text_match = re.search(r'<div[^>]*data-testid="tweetText"[^>]*>(.*?)</div>', tweet_html, re.DOTALL)
-                if text_match:
-                    # Clean HTML tags
-                    text = re.sub(r'<[^>]+>', '', text_match.group(1))
-                    text = text.strip()
+            url = f"https://{instance}/{username}"
 
-                    if text:
-                        tweets.append(ScrapedTweet(text=text))
+            tweets = self._tracked_parse(url, XCancelTimelineParser(count), timeout=15).tweets
 
         except Exception as e:
             print(f"[XCancel] Failed: {e}")
@@ -178,75 +386,54 @@ class TwitterScraper:
         try:
             url = f"https://{instance}/{username}"
 
-            req = urllib.request.Request(url, headers=self.headers)
-            with urllib.request.urlopen(req, timeout=15, context=SSL_CONTEXT) as response:
-                html = self._decompress_response(response)
-
-            # Nitter tweet pattern
-            tweet_pattern = r'<div class="timeline-item[^"]*"(.*?)</div>\s*(?=<div class="timeline-item|</main>)'
-            tweets_html = re.findall(tweet_pattern, html, re.DOTALL)
-
-            for tweet_html in tweets_html[:count]:
-                # Extract tweet text
-                text_match = re.search(r'<div class="tweet-content[^>]*>(.*?)</div>', tweet_html, re.DOTALL)
-                if text_match:
-                    text = re.sub(r'<[^>]+>', '', text_match.group(1))
-                    text = text.strip()
-
-                    # Extract stats
-                    likes_match = re.search(r'(\d+)\s*Likes', tweet_html)
-                    likes = int(likes_match.group(1)) if likes_match else 0
-
-                    if text:
-                        tweets.append(ScrapedTweet(text=text, likes=likes))
+            tweets = self._tracked_parse(url, NitterTimelineParser(count), timeout=15).tweets
 
         except Exception as e:
             print(f"[Nitter:{instance}] Failed: {e}")
 
         return tweets
 
-    def fetch_tweets(self, username: str, count: int = 50) -> List[Dict]:
+    def fetch_tweets(self, username: str, count: int = 50, force_refresh: bool = False) -> List[Dict]:
         """
         Fetch tweets using multiple methods.
 
-        Tries each method until one succeeds.
+        Serves a fresh cached timeline when available, otherwise tries each
+        method until one succeeds. Pass force_refresh=True to bypass the cache.
         Returns list of tweet dictionaries.
         """
+        self.last_from_cache = False
+        if not force_refresh:
+            cached = self.cache.get(username, count)
+            if cached is not None:
+                self.working_method = cached.method
+                self.last_from_cache = True
+                return cached.tweets
+
+        tweets = self._fetch_tweets_uncached(username, count)
+        if tweets:
+            self.cache.set(username, count, tweets, self.working_method)
+        return tweets
+
+    def _fetch_tweets_uncached(self, username: str, count: int) -> List[Dict]:
+        """Try each scraping method in order, without consulting the cache."""
         # Try syndication API first
         tweets = self.fetch_tweets_syndication(username, count)
 
         if tweets:
-            return [
-                {
-                    "text": t.text,
-                    "likes": t.likes,
-                    "retweets": t.retweets,
-                    "replies": t.replies,
-                    "impressions": t.views or 100,
-                }
-                for t in tweets
-            ]
-
-        # Try alternative instances
-        for instance in self.ALTERNATIVE_INSTANCES:
+            return to_tweet_dicts(tweets)
+
+        # Try alternative instances, healthiest first; open breakers are skipped
+        for instance in self.health.ordered(self.ALTERNATIVE_INSTANCES):
             try:
-                if "xcancel" in instance or "twiiit" in instance:
-                    tweets = self.fetch_tweets_xcancel(username, count)
+                if is_xcancel_like(instance):
+                    tweets = self.fetch_tweets_xcancel(username, count, instance)
                 else:
                     tweets = self.fetch_tweets_nitter(username, instance, count)
 
                 if tweets:
                     self.working_instance = instance
-                    return [
-                        {
-                            "text": t.text,
-                            "likes": t.likes,
-                            "retweets": t.retweets or 0,
-                            "replies": t.replies or 0,
-                            "impressions": t.views or 100,
-                        }
-                        for t in tweets
-                    ]
+                    self.working_method = instance
+                    return to_tweet_dicts(tweets)
             except Exception:
                 continue
 
@@ -263,15 +450,32 @@ class TwitterScraper:
         }
 
         methods_to_test = [
-            ("Syndication API", lambda: self.fetch_tweets_syndication("elonmusk", 5)),
+            ("Syndication API", self.SYNDICATION_HOST, lambda: self.fetch_tweets_syndication("elonmusk", 5)),
         ]
 
         for instance in self.ALTERNATIVE_INSTANCES[:2]:  # Test 2 instances
             methods_to_test.append(
-                (f"xcancel/{instance}", lambda: self.fetch_tweets_xcancel("elonmusk", 5))
+                (f"xcancel/{instance}", instance,
+                 lambda instance=instance: self.fetch_tweets_xcancel("elonmusk", 5, instance))
             )
 
-        for method_name, test_func in methods_to_test:
+        for method_name, host, test_func in methods_to_test:
+            # Reuse recent measurements instead of re-probing on every call
+            health = self.health.get(host)
+            if health.is_open:
+                status["methods_status"].append(
+                    f"[FAIL] {method_name} (circuit open, retry in {health.to_dict()['retry_in']}s)"
+                )
+                continue
+            if self.health.is_fresh(host) and health.consecutive_failures:
+                status["methods_status"].append(f"[FAIL] {method_name}")
+                continue
+            if self.health.is_fresh(host) and health.consecutive_failures == 0:
+                status["working"] = True
+                status["working_method"] = method_name
+                status["methods_status"].append(f"[OK] {method_name}")
+                continue
+
             try:
                 result = test_func()
                 if result:
@@ -283,6 +487,7 @@ class TwitterScraper:
             except Exception as e:
                 status["methods_status"].append(f"[ERROR] {method_name}: {str(e)[:50]}")
 
+        status["health"] = self.health.snapshot()
         return status
 
 
@@ -0,0 +1,17 @@
+"""
+Shared test setup.
+
+Settings are read at import time, so placeholder values for the required
+ones are set before any app module is imported.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-service-role-key")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-" + "x" * 32)
+
+# Make `app` resolve to this package even when pytest runs from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
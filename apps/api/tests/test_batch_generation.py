@@ -0,0 +1,151 @@
+"""
+Tests for offline batch generation, run against FakeBatchBackend.
+"""
+
+import asyncio
+import csv
+import json
+
+import pytest
+
+from app.services.batch_generation import FakeBatchBackend, load_batch_items, run_batch_file
+from app.services.claude import ClaudeService
+from app.services.generation_cache import GenerationCache, MemoryGenerationStore, get_generation_cache
+
+
+def write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    return str(path)
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def failing_responder(params):
+    """Fail requests about "broken" topics, echo a fixed tweet otherwise."""
+    if "broken" in params["messages"][-1]["content"]:
+        raise RuntimeError("overloaded")
+    return "Do you write tests before the code?"
+
+
+def test_load_batch_items_csv(tmp_path):
+    path = tmp_path / "items.csv"
+    path.write_text(
+        "id,topic,tone,include_cta,include_emoji\n"
+        "a,Python tips,witty,no,yes\n"
+        ",AI agents,,false,\n",
+        encoding="utf-8",
+    )
+
+    assert load_batch_items(str(path)) == [
+        {"id": "a", "topic": "Python tips", "tone": "witty", "include_cta": False, "include_emoji": True},
+        # Empty cells fall back to defaults; a missing id becomes the row number
+        {"id": "2", "topic": "AI agents", "include_cta": False},
+    ]
+
+
+def test_load_batch_items_jsonl(tmp_path):
+    path = write_jsonl(tmp_path / "items.jsonl", [
+        {"id": 7, "topic": "  Startups  ", "include_cta": False, "include_emoji": "no"},
+        {"topic": "Careers", "include_cta": "true", "language": "en"},
+    ])
+
+    assert load_batch_items(path) == [
+        {"id": "7", "topic": "Startups", "include_cta": False, "include_emoji": False},
+        {"id": "2", "topic": "Careers", "include_cta": True, "language": "en"},
+    ]
+
+
+@pytest.mark.parametrize("name, content", [
+    ("items.csv", "id,topic\n1,Python\n2,\n"),
+    ("items.jsonl", '{"topic": "Python"}\n{"id": "x"}\n'),
+])
+def test_load_batch_items_requires_topic(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+
+    with pytest.raises(ValueError, match="row 2 has no topic"):
+        load_batch_items(str(path))
+
+
+def test_run_batch_file_polls_until_done(tmp_path):
+    input_path = write_jsonl(tmp_path / "items.jsonl", [{"topic": "Python"}, {"topic": "Rust"}])
+    output_path = str(tmp_path / "out.jsonl")
+    backend = FakeBatchBackend(polls_until_done=3)
+
+    summary = asyncio.run(run_batch_file(input_path, output_path, backend=backend, poll_interval=0))
+
+    assert summary == {"batch_id": "fake_batch_1", "total": 2, "succeeded": 2, "failed": 0}
+    assert backend.batches["fake_batch_1"]["polls"] == 3
+    results = read_jsonl(output_path)
+    assert [r["topic"] for r in results] == ["Python", "Rust"]
+    assert all(r["content"].startswith("[fake]") and r["error"] is None for r in results)
+    assert all(r["analysis"]["score"] >= 0 for r in results)
+
+
+def test_run_batch_file_timeout(tmp_path):
+    input_path = write_jsonl(tmp_path / "items.jsonl", [{"topic": "Python"}])
+    backend = FakeBatchBackend(polls_until_done=10 ** 9)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run_batch_file(
+            input_path, str(tmp_path / "out.jsonl"), backend=backend, poll_interval=0.001, timeout=0.01
+        ))
+
+
+def test_run_batch_file_responder_error(tmp_path):
+    input_path = write_jsonl(tmp_path / "items.jsonl", [{"topic": "broken topic"}, {"topic": "Python"}])
+    output_path = str(tmp_path / "out.jsonl")
+
+    summary = asyncio.run(run_batch_file(
+        input_path, output_path, backend=FakeBatchBackend(failing_responder), poll_interval=0
+    ))
+
+    assert (summary["succeeded"], summary["failed"]) == (1, 1)
+    failed, ok = read_jsonl(output_path)
+    assert failed["error"] == "overloaded"
+    assert failed["content"] is None
+    assert failed["analysis"] is None
+    assert ok["error"] is None
+    assert ok["content"] == "Do you write tests before the code?"
+    assert ok["analysis"] is not None
+
+
+def test_run_batch_file_writes_csv(tmp_path):
+    input_path = write_jsonl(tmp_path / "items.jsonl", [
+        {"id": "a", "topic": "Python", "include_cta": "no"},
+        {"id": "b", "topic": "broken topic"},
+    ])
+    output_path = str(tmp_path / "out.csv")
+
+    asyncio.run(run_batch_file(
+        input_path, output_path, backend=FakeBatchBackend(failing_responder), poll_interval=0
+    ))
+
+    with open(output_path, newline="", encoding="utf-8") as f:
+        ok, failed = list(csv.DictReader(f))
+    assert ok["id"] == "a"
+    assert ok["include_cta"] == "False"
+    assert ok["content"] == "Do you write tests before the code?"
+    assert float(ok["score"]) == json.loads(ok["analysis"])["score"]
+    assert ok["error"] == ""
+    assert failed["id"] == "b"
+    assert (failed["content"], failed["score"], failed["analysis"]) == ("", "", "")
+    assert failed["error"] == "overloaded"
+
+
+def test_fake_backend_replies_are_not_cached(tmp_path):
+    input_path = write_jsonl(tmp_path / "items.jsonl", [{"topic": "Python"}, {"topic": "Rust"}])
+    entries = get_generation_cache().stats()["entries"]
+
+    asyncio.run(run_batch_file(input_path, str(tmp_path / "out.jsonl"), backend=FakeBatchBackend(), poll_interval=0))
+    assert get_generation_cache().stats()["entries"] == entries
+
+    cache = GenerationCache(MemoryGenerationStore(16), ttl=60)
+    items = load_batch_items(input_path)
+    asyncio.run(ClaudeService(cache=cache).generate_batch(
+        items, backend=FakeBatchBackend(), poll_interval=0, cache_results=True
+    ))
+    assert cache.stats()["entries"] == 2
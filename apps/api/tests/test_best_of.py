@@ -0,0 +1,46 @@
+"""
+Tests for best-of-N candidate generation, run against a fake Claude client.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from app.services.claude import BEST_OF_MAX_TOKENS, ClaudeService
+from app.services.generation_cache import GenerationCache, MemoryGenerationStore
+
+
+class FakeMessages:
+    def __init__(self, text, stop_reason="end_turn"):
+        self.text = text
+        self.stop_reason = stop_reason
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)], stop_reason=self.stop_reason)
+
+
+def fake_service(messages):
+    service = ClaudeService(cache=GenerationCache(MemoryGenerationStore(16), ttl=60))
+    service.client = SimpleNamespace(messages=messages)
+    return service
+
+
+def test_generate_candidates_clamps_n_to_token_budget():
+    messages = FakeMessages("First?\n---\nSecond!")
+
+    asyncio.run(fake_service(messages).generate_candidates("Python", n=8))
+
+    (call,) = messages.calls
+    assert call["max_tokens"] <= BEST_OF_MAX_TOKENS
+    assert "Write 4 different tweets" in call["messages"][-1]["content"]
+
+
+def test_generate_candidates_drops_truncated_last_candidate():
+    messages = FakeMessages("First?\n---\nSecond!\n---\nThi", stop_reason="max_tokens")
+    service = fake_service(messages)
+
+    assert asyncio.run(service.generate_candidates("Python", n=3)) == ["First?", "Second!"]
+    # The trimmed reply is what gets cached
+    assert asyncio.run(service.generate_candidates("Python", n=3)) == ["First?", "Second!"]
+    assert len(messages.calls) == 1
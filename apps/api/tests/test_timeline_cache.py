@@ -0,0 +1,38 @@
+"""
+Tests for the timeline cache's async wrappers.
+"""
+
+import asyncio
+import threading
+
+from app.services.timeline_cache import TimelineCache
+
+TWEETS = [{"text": "hello world, this is a tweet"}]
+
+
+def test_sqlite_store_runs_off_the_event_loop(tmp_path, monkeypatch):
+    cache = TimelineCache(ttl=60, max_entries=8, db_path=str(tmp_path / "timelines.db"))
+    threads = []
+    get = cache.get
+    monkeypatch.setattr(cache, "get", lambda *args: threads.append(threading.get_ident()) or get(*args))
+
+    async def main():
+        await cache.aset("@Someone", 1, TWEETS, "syndication")
+        return threading.get_ident(), await cache.aget("someone", 1)
+
+    loop_thread, cached = asyncio.run(main())
+
+    assert cached.tweets == TWEETS
+    assert threads and loop_thread not in threads
+    # A fresh cache over the same file sees the entry
+    assert TimelineCache(ttl=60, max_entries=8, db_path=str(tmp_path / "timelines.db")).get("someone", 1)
+
+
+def test_memory_store_stays_on_the_event_loop():
+    cache = TimelineCache(ttl=60, max_entries=8)
+
+    async def main():
+        await cache.aset("someone", 1, TWEETS, "syndication")
+        return await cache.aget("someone", 1)
+
+    assert asyncio.run(main()).method == "syndication"
@@ -0,0 +1,21 @@
+"""
+Tests for tweet request validation.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.tweet import TweetGenerateRequest
+
+
+def test_best_of_defaults_to_one():
+    request = TweetGenerateRequest(topic="abc")
+
+    assert (request.best_of, request.top_k) == (1, 1)
+
+
+@pytest.mark.parametrize("field", ["best_of", "top_k"])
+@pytest.mark.parametrize("value", [None, 0, 5])
+def test_best_of_and_top_k_are_bounded_ints(field, value):
+    with pytest.raises(ValidationError):
+        TweetGenerateRequest(topic="abc", **{field: value})
@@ -0,0 +1,45 @@
+-- Analytics overview aggregation
+-- Supabase Migration
+--
+-- /analytics/overview used to download every tweet (including the analysis
+-- JSON) and aggregate in Python. This function computes the same summary
+-- inside the database and returns a single row.
+
+CREATE OR REPLACE FUNCTION public.tweet_analytics_overview(p_user_id UUID)
+RETURNS TABLE (
+    total_tweets BIGINT,
+    draft_count BIGINT,
+    scheduled_count BIGINT,
+    posted_count BIGINT,
+    avg_score NUMERIC,
+    recent_activity BIGINT,
+    high_performers BIGINT
+) AS $$
+    WITH user_tweets AS (
+        SELECT
+            status,
+            created_at,
+            -- Only non-empty analysis objects carry a score; a missing score counts
+            -- as 0 and a non-numeric one (analysis is client-supplied) is skipped
+            CASE
+                WHEN jsonb_typeof(analysis) IS DISTINCT FROM 'object' OR analysis = '{}'::jsonb THEN NULL
+                WHEN jsonb_typeof(analysis->'score') = 'number' THEN (analysis->'score')::NUMERIC
+                WHEN COALESCE(jsonb_typeof(analysis->'score'), 'null') = 'null' THEN 0
+            END AS score
+        FROM public.tweets
+        WHERE user_id = p_user_id
+    )
+    SELECT
+        COUNT(*),
+        COUNT(*) FILTER (WHERE status = 'draft'),
+        COUNT(*) FILTER (WHERE status = 'scheduled'),
+        COUNT(*) FILTER (WHERE status = 'posted'),
+        COALESCE(ROUND(AVG(score), 1), 0),
+        COUNT(*) FILTER (WHERE created_at > NOW() - INTERVAL '7 days'),
+        COUNT(*) FILTER (WHERE score >= 70)
+    FROM user_tweets;
+$$ LANGUAGE sql STABLE;
+
+-- Called by the API with the service role key; RLS still applies to other callers
+REVOKE EXECUTE ON FUNCTION public.tweet_analytics_overview(UUID) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.tweet_analytics_overview(UUID) TO authenticated, service_role;
@@ -0,0 +1,131 @@
+-- Daily tweet rollup
+-- Supabase Migration
+--
+-- /analytics/performance used to re-read every tweet in the window and group
+-- by day in Python. tweet_daily_stats keeps one row per user and UTC day,
+-- maintained by triggers on tweets, so the endpoint is a range scan over at
+-- most `days` rows.
+
+CREATE TABLE IF NOT EXISTS tweet_daily_stats (
+    user_id UUID NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    tweet_count INT NOT NULL DEFAULT 0,
+    total_score NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (user_id, day)
+);
+
+ALTER TABLE tweet_daily_stats ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own daily stats" ON tweet_daily_stats
+    FOR SELECT USING (auth.uid() = user_id);
+
+-- Score of one tweet as the analytics routes count it: a missing score is 0.
+-- analysis is client-supplied, so anything but a JSON number also counts as 0
+-- rather than failing the write.
+CREATE OR REPLACE FUNCTION public.tweet_score(p_analysis JSONB)
+RETURNS NUMERIC AS $$
+    SELECT CASE
+        WHEN jsonb_typeof(p_analysis->'score') = 'number' THEN (p_analysis->'score')::NUMERIC
+        ELSE 0
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Add (p_sign = 1) or remove (p_sign = -1) one tweet from its day's rollup
+CREATE OR REPLACE FUNCTION public.apply_tweet_daily_stats(
+    p_user_id UUID,
+    p_created_at TIMESTAMPTZ,
+    p_score NUMERIC,
+    p_sign INT
+)
+RETURNS VOID AS $$
+DECLARE
+    v_day DATE := (p_created_at AT TIME ZONE 'UTC')::DATE;
+BEGIN
+    IF p_user_id IS NULL OR p_created_at IS NULL THEN
+        RETURN;
+    END IF;
+
+    IF p_sign > 0 THEN
+        INSERT INTO public.tweet_daily_stats AS s (user_id, day, tweet_count, total_score)
+        VALUES (p_user_id, v_day, 1, p_score)
+        ON CONFLICT (user_id, day) DO UPDATE SET
+            tweet_count = s.tweet_count + 1,
+            total_score = s.total_score + EXCLUDED.total_score,
+            updated_at = NOW();
+    ELSE
+        -- Update in place only: during a profile delete cascade the row is already gone
+        UPDATE public.tweet_daily_stats SET
+            tweet_count = tweet_count - 1,
+            total_score = total_score - p_score,
+            updated_at = NOW()
+        WHERE user_id = p_user_id AND day = v_day;
+
+        DELETE FROM public.tweet_daily_stats
+        WHERE user_id = p_user_id AND day = v_day AND tweet_count <= 0;
+    END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION public.maintain_tweet_daily_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND NEW.user_id IS NOT DISTINCT FROM OLD.user_id
+        AND NEW.created_at IS NOT DISTINCT FROM OLD.created_at
+        AND tweet_score(NEW.analysis) = tweet_score(OLD.analysis)
+    THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_tweet_daily_stats(OLD.user_id, OLD.created_at, tweet_score(OLD.analysis), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_tweet_daily_stats(NEW.user_id, NEW.created_at, tweet_score(NEW.analysis), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS maintain_tweet_daily_stats ON tweets;
+CREATE TRIGGER maintain_tweet_daily_stats
+    AFTER INSERT OR UPDATE OR DELETE ON tweets
+    FOR EACH ROW EXECUTE FUNCTION public.maintain_tweet_daily_stats();
+
+-- Rebuild the rollup from tweets, for one user or everyone (NULL).
+-- Run after bulk loads that bypass triggers, or to repair drift.
+CREATE OR REPLACE FUNCTION public.backfill_tweet_daily_stats(p_user_id UUID DEFAULT NULL)
+RETURNS BIGINT AS $$
+DECLARE
+    v_rows BIGINT;
+BEGIN
+    -- Block tweet writes (and their triggers) until the rebuild commits
+    LOCK TABLE public.tweets IN SHARE MODE;
+
+    DELETE FROM public.tweet_daily_stats
+    WHERE p_user_id IS NULL OR user_id = p_user_id;
+
+    INSERT INTO public.tweet_daily_stats (user_id, day, tweet_count, total_score)
+    SELECT
+        user_id,
+        (created_at AT TIME ZONE 'UTC')::DATE,
+        COUNT(*),
+        SUM(tweet_score(analysis))
+    FROM public.tweets
+    WHERE user_id IS NOT NULL
+        AND created_at IS NOT NULL
+        AND (p_user_id IS NULL OR user_id = p_user_id)
+    GROUP BY 1, 2;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION public.apply_tweet_daily_stats(UUID, TIMESTAMPTZ, NUMERIC, INT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.backfill_tweet_daily_stats(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.backfill_tweet_daily_stats(UUID) TO service_role;
+
+-- Initial backfill
+SELECT public.backfill_tweet_daily_stats();
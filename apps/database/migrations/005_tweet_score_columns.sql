@@ -0,0 +1,149 @@
+-- Typed score / engagement columns and composite indexes for tweets
+-- Supabase Migration
+--
+-- Analytics read the score out of the analysis JSON for every row, so it
+-- could not be filtered, sorted or aggregated by the database. These columns
+-- are derived from analysis whenever it is written. analysis is
+-- client-supplied (POST /scheduling/), so values that aren't JSON numbers
+-- are stored as NULL instead of failing the write.
+
+ALTER TABLE tweets
+    ADD COLUMN IF NOT EXISTS score NUMERIC,  -- NULL when the tweet has no analysis (unbounded, like the JSON)
+    ADD COLUMN IF NOT EXISTS pred_favorite REAL,
+    ADD COLUMN IF NOT EXISTS pred_reply REAL,
+    ADD COLUMN IF NOT EXISTS pred_repost REAL,
+    ADD COLUMN IF NOT EXISTS pred_quote REAL,
+    ADD COLUMN IF NOT EXISTS pred_follow_author REAL;
+
+-- A JSON number as REAL, or NULL when it isn't one or doesn't fit
+CREATE OR REPLACE FUNCTION public.jsonb_to_real(p_value JSONB)
+RETURNS REAL AS $$
+    SELECT CASE
+        WHEN jsonb_typeof(p_value) <> 'number' THEN NULL
+        WHEN p_value::NUMERIC = 0 THEN 0
+        WHEN abs(p_value::NUMERIC) BETWEEN 1e-37 AND 1e37 THEN p_value::NUMERIC::REAL
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Keep the columns in sync with analysis on every insert and analysis update
+CREATE OR REPLACE FUNCTION public.sync_tweet_analysis_columns()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_prediction JSONB := CASE
+        WHEN jsonb_typeof(NEW.analysis->'engagement_prediction') = 'object'
+        THEN NEW.analysis->'engagement_prediction'
+    END;
+BEGIN
+    -- Only non-empty analysis objects are scored; a missing score counts as 0,
+    -- a non-numeric one is NULL
+    NEW.score := CASE
+        WHEN jsonb_typeof(NEW.analysis) IS DISTINCT FROM 'object' OR NEW.analysis = '{}'::jsonb THEN NULL
+        WHEN jsonb_typeof(NEW.analysis->'score') = 'number' THEN (NEW.analysis->'score')::NUMERIC
+        WHEN COALESCE(jsonb_typeof(NEW.analysis->'score'), 'null') = 'null' THEN 0
+    END;
+    NEW.pred_favorite := public.jsonb_to_real(v_prediction->'favorite');
+    NEW.pred_reply := public.jsonb_to_real(v_prediction->'reply');
+    NEW.pred_repost := public.jsonb_to_real(v_prediction->'repost');
+    NEW.pred_quote := public.jsonb_to_real(v_prediction->'quote');
+    NEW.pred_follow_author := public.jsonb_to_real(v_prediction->'follow_author');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS sync_tweet_analysis_columns ON tweets;
+CREATE TRIGGER sync_tweet_analysis_columns
+    BEFORE INSERT OR UPDATE OF analysis ON tweets
+    FOR EACH ROW EXECUTE FUNCTION public.sync_tweet_analysis_columns();
+
+-- Backfill existing rows. Rewriting analysis fires the sync trigger; the
+-- updated_at and rollup triggers are paused because nothing user-visible
+-- changes (the rollup already counts these scores).
+ALTER TABLE tweets DISABLE TRIGGER update_tweets_updated_at;
+ALTER TABLE tweets DISABLE TRIGGER maintain_tweet_daily_stats;
+
+UPDATE tweets SET analysis = analysis WHERE analysis IS NOT NULL;
+
+ALTER TABLE tweets ENABLE TRIGGER update_tweets_updated_at;
+ALTER TABLE tweets ENABLE TRIGGER maintain_tweet_daily_stats;
+
+-- Composite indexes for per-user listings, analytics windows and the
+-- scheduling queue. (user_id, created_at) also serves plain user_id lookups.
+CREATE INDEX IF NOT EXISTS idx_tweets_user_created_at ON tweets(user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_tweets_user_status_scheduled_for ON tweets(user_id, status, scheduled_for);
+DROP INDEX IF EXISTS idx_tweets_user_id;
+
+-- Analytics functions read the typed column from now on
+
+CREATE OR REPLACE FUNCTION public.tweet_analytics_overview(p_user_id UUID)
+RETURNS TABLE (
+    total_tweets BIGINT,
+    draft_count BIGINT,
+    scheduled_count BIGINT,
+    posted_count BIGINT,
+    avg_score NUMERIC,
+    recent_activity BIGINT,
+    high_performers BIGINT
+) AS $$
+    SELECT
+        COUNT(*),
+        COUNT(*) FILTER (WHERE status = 'draft'),
+        COUNT(*) FILTER (WHERE status = 'scheduled'),
+        COUNT(*) FILTER (WHERE status = 'posted'),
+        COALESCE(ROUND(AVG(score), 1), 0),
+        COUNT(*) FILTER (WHERE created_at > NOW() - INTERVAL '7 days'),
+        COUNT(*) FILTER (WHERE score >= 70)
+    FROM public.tweets
+    WHERE user_id = p_user_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION public.maintain_tweet_daily_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND NEW.user_id IS NOT DISTINCT FROM OLD.user_id
+        AND NEW.created_at IS NOT DISTINCT FROM OLD.created_at
+        AND COALESCE(NEW.score, 0) = COALESCE(OLD.score, 0)
+    THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_tweet_daily_stats(OLD.user_id, OLD.created_at, COALESCE(OLD.score, 0), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_tweet_daily_stats(NEW.user_id, NEW.created_at, COALESCE(NEW.score, 0), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION public.backfill_tweet_daily_stats(p_user_id UUID DEFAULT NULL)
+RETURNS BIGINT AS $$
+DECLARE
+    v_rows BIGINT;
+BEGIN
+    -- Block tweet writes (and their triggers) until the rebuild commits
+    LOCK TABLE public.tweets IN SHARE MODE;
+
+    DELETE FROM public.tweet_daily_stats
+    WHERE p_user_id IS NULL OR user_id = p_user_id;
+
+    INSERT INTO public.tweet_daily_stats (user_id, day, tweet_count, total_score)
+    SELECT
+        user_id,
+        (created_at AT TIME ZONE 'UTC')::DATE,
+        COUNT(*),
+        SUM(COALESCE(score, 0))
+    FROM public.tweets
+    WHERE user_id IS NOT NULL
+        AND created_at IS NOT NULL
+        AND (p_user_id IS NULL OR user_id = p_user_id)
+    GROUP BY 1, 2;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Rebuild the rollup from the typed column so later deltas subtract the same values
+SELECT public.backfill_tweet_daily_stats();
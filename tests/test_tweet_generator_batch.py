@@ -0,0 +1,162 @@
+"""
+XAlgorithmTweetGenerator.generate_batch testleri.
+
+API'ye gitmeden FakeBatchBackend ile çalışır.
+"""
+
+import csv
+import json
+
+import pytest
+
+from tweet_generator import (
+    FakeBatchBackend,
+    GenerationCache,
+    XAlgorithmTweetGenerator,
+    load_batch_jobs,
+)
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    return XAlgorithmTweetGenerator(generation_cache=GenerationCache())
+
+
+def write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows), encoding="utf-8")
+    return str(path)
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_load_batch_jobs_csv(tmp_path):
+    path = tmp_path / "jobs.csv"
+    path.write_text(
+        "id,topic,style,include_cta,include_emoji\n"
+        "a,Python ipuçları,casual,no,evet\n"
+        ",Yapay zeka,,false,\n",
+        encoding="utf-8",
+    )
+
+    jobs = load_batch_jobs(str(path))
+
+    assert jobs == [
+        {"id": "a", "topic": "Python ipuçları", "style": "casual", "include_cta": False, "include_emoji": True},
+        # Boş hücreler varsayılana bırakılır, id yoksa satır numarası kullanılır
+        {"id": "2", "topic": "Yapay zeka", "include_cta": False},
+    ]
+
+
+def test_load_batch_jobs_jsonl(tmp_path):
+    path = write_jsonl(tmp_path / "jobs.jsonl", [
+        {"id": 7, "topic": "  Startup  ", "include_cta": False, "include_emoji": "no"},
+        {"topic": "Kariyer", "include_cta": "yes", "language": "en"},
+    ])
+
+    jobs = load_batch_jobs(path)
+
+    assert jobs == [
+        {"id": "7", "topic": "Startup", "include_cta": False, "include_emoji": False},
+        {"id": "2", "topic": "Kariyer", "include_cta": True, "language": "en"},
+    ]
+
+
+@pytest.mark.parametrize("name, content", [
+    ("jobs.csv", "id,topic\n1,Python\n2,\n"),
+    ("jobs.jsonl", '{"topic": "Python"}\n{"id": "x"}\n'),
+])
+def test_load_batch_jobs_requires_topic(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+
+    with pytest.raises(ValueError, match="2. satır"):
+        load_batch_jobs(str(path))
+
+
+def test_generate_batch_polls_until_done(generator, tmp_path):
+    input_path = write_jsonl(tmp_path / "jobs.jsonl", [{"topic": "Python"}, {"topic": "Rust"}])
+    output_path = str(tmp_path / "out.jsonl")
+    backend = FakeBatchBackend(polls_until_done=3)
+
+    summary = generator.generate_batch(input_path, output_path, backend=backend, poll_interval=0)
+
+    assert summary == {"batch_id": "fake_batch_1", "total": 2, "succeeded": 2, "failed": 0}
+    assert backend.batches["fake_batch_1"]["polls"] == 3
+    results = read_jsonl(output_path)
+    assert [r["topic"] for r in results] == ["Python", "Rust"]
+    assert all(r["tweet"].startswith("[fake]") and r["error"] is None for r in results)
+    assert all(r["analysis"]["score"] == generator.analyze_tweet(r["tweet"]).score for r in results)
+
+
+def test_generate_batch_timeout(generator, tmp_path):
+    input_path = write_jsonl(tmp_path / "jobs.jsonl", [{"topic": "Python"}])
+    backend = FakeBatchBackend(polls_until_done=10 ** 9)
+
+    with pytest.raises(TimeoutError):
+        generator.generate_batch(
+            input_path, str(tmp_path / "out.jsonl"), backend=backend, poll_interval=0.001, timeout=0.01
+        )
+
+
+def test_generate_batch_responder_error(generator, tmp_path):
+    def responder(params):
+        if "Bozuk" in params["messages"][-1]["content"]:
+            raise RuntimeError("overloaded")
+        return "Tamam: bugün öğrendiğim en iyi şey neydi?"
+
+    input_path = write_jsonl(tmp_path / "jobs.jsonl", [{"topic": "Bozuk konu"}, {"topic": "Python"}])
+    output_path = str(tmp_path / "out.jsonl")
+
+    summary = generator.generate_batch(
+        input_path, output_path, backend=FakeBatchBackend(responder), poll_interval=0
+    )
+
+    assert (summary["succeeded"], summary["failed"]) == (1, 1)
+    failed, ok = read_jsonl(output_path)
+    assert failed["error"] == "overloaded"
+    assert failed["analysis"] is None
+    assert failed["tweet"] == ""
+    assert ok["error"] is None
+    assert ok["analysis"] is not None
+
+
+def test_generate_batch_writes_csv(generator, tmp_path):
+    def responder(params):
+        if "Bozuk" in params["messages"][-1]["content"]:
+            raise RuntimeError("overloaded")
+        return "Python'da list comprehension kullanıyor musun?"
+
+    input_path = write_jsonl(tmp_path / "jobs.jsonl", [
+        {"id": "a", "topic": "Python", "include_cta": "no"},
+        {"id": "b", "topic": "Bozuk konu"},
+    ])
+    output_path = str(tmp_path / "out.csv")
+
+    generator.generate_batch(input_path, output_path, backend=FakeBatchBackend(responder), poll_interval=0)
+
+    with open(output_path, newline="", encoding="utf-8") as f:
+        ok, failed = list(csv.DictReader(f))
+    assert ok["id"] == "a"
+    assert ok["include_cta"] == "False"
+    assert ok["tweet"] == "Python'da list comprehension kullanıyor musun?"
+    assert float(ok["score"]) == json.loads(ok["analysis"])["score"]
+    assert ok["error"] == ""
+    assert failed["id"] == "b"
+    assert (failed["tweet"], failed["score"], failed["analysis"]) == ("", "", "")
+    assert failed["error"] == "overloaded"
+
+
+def test_generate_batch_skips_cache_for_fake_backend(generator, tmp_path):
+    input_path = write_jsonl(tmp_path / "jobs.jsonl", [{"topic": "Python"}, {"topic": "Rust"}])
+
+    generator.generate_batch(input_path, str(tmp_path / "out.jsonl"), backend=FakeBatchBackend(), poll_interval=0)
+    assert generator.generation_cache.stats()["entries"] == 0
+
+    generator.generate_batch(
+        input_path, str(tmp_path / "out.jsonl"), backend=FakeBatchBackend(), poll_interval=0, cache_results=True
+    )
+    assert generator.generation_cache.stats()["entries"] == 2
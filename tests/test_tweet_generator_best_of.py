@@ -0,0 +1,55 @@
+"""
+XAlgorithmTweetGenerator best-of-N testleri.
+
+Claude istemcisi sahte bir nesneyle değiştirilir; API'ye gidilmez.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from tweet_generator import BEST_OF_N_MAX_TOKENS, GenerationCache, XAlgorithmTweetGenerator
+
+
+class FakeMessages:
+    def __init__(self, text, stop_reason="end_turn"):
+        self.text = text
+        self.stop_reason = stop_reason
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=self.text)], stop_reason=self.stop_reason, usage=None
+        )
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    return XAlgorithmTweetGenerator(generation_cache=GenerationCache())
+
+
+def use_fake_client(generator, messages):
+    generator.client = SimpleNamespace(messages=messages)
+
+
+def test_best_of_clamps_n_to_token_budget(generator):
+    messages = FakeMessages("Birinci tweet?\n---\nİkinci tweet!")
+    use_fake_client(generator, messages)
+
+    candidates = generator.generate_best_of("Python", n=6, top_k=6, length="epic")
+
+    (call,) = messages.calls
+    assert call["max_tokens"] <= BEST_OF_N_MAX_TOKENS
+    assert "2 VARYANT" in call["messages"][-1]["content"]
+    assert len(candidates) == 2
+
+
+def test_best_of_drops_truncated_last_candidate(generator):
+    messages = FakeMessages("Birinci tweet?\n---\nİkinci tweet!\n---\nÜçüncü tw", stop_reason="max_tokens")
+    use_fake_client(generator, messages)
+
+    candidates = generator.generate_best_of("Python", n=3, top_k=3)
+
+    assert sorted(c.text for c in candidates) == ["Birinci tweet?", "İkinci tweet!"]